@@ -0,0 +1,114 @@
+from typing import Any, Dict, List, Mapping, Set, Tuple
+
+
+MAX_BATCH_OPERATIONS = 5000      # rows per POST /tables/{table}/batch
+
+INTEGER_TYPES = {"smallint", "integer", "bigint"}
+
+# (sql, [params, ...]) – run with executemany, one statement per column set
+Statement = Tuple[str, List[Dict[str, Any]]]
+
+
+class BatchError(ValueError):
+    """The batch body is malformed or names columns the table lacks."""
+
+
+def coerce_row(row: Mapping[str, Any], column_types: Mapping[str, str]) -> Dict[str, Any]:
+    """
+    Lists are joined to ``"a, b"`` for TEXT columns (uploaded tables) and
+    kept as lists for ARRAY columns (tables created from the model);
+    group_no follows its column's type.
+    """
+    out = {}
+    for key, val in row.items():
+        if isinstance(val, list) and column_types.get(key) != "ARRAY":
+            val = ", ".join(str(item) for item in val)
+        elif key == "group_no" and val is not None:
+            if column_types.get(key) not in INTEGER_TYPES:
+                val = str(val)
+            elif not isinstance(val, int):
+                try:
+                    val = int(val)
+                except ValueError:
+                    raise BatchError(f"group_no must be a number, got {val!r}")
+        out[key] = val
+    return out
+
+
+def plan_batch(
+    table_name: str,
+    batch: Mapping[str, Any],
+    column_types: Mapping[str, str],
+    generated: Set[str] = frozenset()
+) -> List[Statement]:
+    """
+    Turn ``{"delete": [group_no, …], "update": [{"group_no": …, "data": {…}}, …],
+    "insert": [{column: value, …}, …]}`` into parameterised statements.
+
+    Deletes run first, then updates, then inserts, so a batch can replace a
+    group by deleting and re-inserting it.  Rows sharing the same column set
+    share one statement, so each group is a single executemany.  Generated
+    columns (search_vector) are dropped, everything else must exist in
+    ``column_types``.
+    """
+    unknown_keys = set(batch) - {"delete", "update", "insert"}
+    if unknown_keys:
+        raise BatchError(f"Unknown batch key(s): {', '.join(sorted(unknown_keys))}")
+
+    deletes = batch.get("delete") or []
+    updates = batch.get("update") or []
+    inserts = batch.get("insert") or []
+    if not isinstance(deletes, list) or not isinstance(updates, list) or not isinstance(inserts, list):
+        raise BatchError("delete, update and insert must be lists")
+    total = len(deletes) + len(updates) + len(inserts)
+    if not total:
+        raise BatchError("Empty batch")
+    if total > MAX_BATCH_OPERATIONS:
+        raise BatchError(f"At most {MAX_BATCH_OPERATIONS} operations per batch")
+
+    def clean(row: Any) -> Dict[str, Any]:
+        if not isinstance(row, dict):
+            raise BatchError("Rows must be JSON objects")
+        row = {k: v for k, v in row.items() if k not in generated}
+        unknown = set(row) - set(column_types)
+        if unknown:
+            raise BatchError(f"Unknown column(s): {', '.join(sorted(unknown))}")
+        return coerce_row(row, column_types)
+
+    statements: List[Statement] = []
+
+    if deletes:
+        statements.append((
+            f'DELETE FROM "{table_name}" WHERE group_no::text = :group_no',
+            [{"group_no": str(group_no)} for group_no in deletes],
+        ))
+
+    grouped: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+    for item in updates:
+        if not isinstance(item, dict) or item.get("group_no") is None:
+            raise BatchError("Every update needs a group_no")
+        data = clean(item.get("data") or {})
+        if data:
+            params = {**data, "where_group_no": str(item["group_no"])}
+            grouped.setdefault(tuple(sorted(data)), []).append(params)
+    for cols, params in grouped.items():
+        assignments = ", ".join(f"{c} = :{c}" for c in cols)
+        statements.append((
+            f'UPDATE "{table_name}" SET {assignments} WHERE group_no::text = :where_group_no',
+            params,
+        ))
+
+    grouped = {}
+    for row in inserts:
+        data = clean(row)
+        if not data:
+            raise BatchError("Inserted rows must not be empty")
+        grouped.setdefault(tuple(sorted(data)), []).append(data)
+    for cols, params in grouped.items():
+        statements.append((
+            f'INSERT INTO "{table_name}" ({", ".join(cols)}) '
+            f'VALUES ({", ".join(f":{c}" for c in cols)})',
+            params,
+        ))
+
+    return statements
@@ -0,0 +1,240 @@
+import math
+import re
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+
+# Same columns, same order as app.search_sql.RESULT_COLUMNS
+DOCUMENT_COLUMNS = (
+    "group_no", "usn", "name", "project_title", "guide_name",
+    "outcomes", "proof_link", "ppt_links", "report_links",
+)
+OPTIONAL_COLUMNS = {"ppt_links", "report_links"}          # '' when missing
+
+# Field weights of search_vector: title is 'A' (1.0), guide is 'B' (0.4),
+# the default ts_rank weights for those labels
+FIELD_WEIGHTS = {"project_title": 1.0, "guide_name": 0.4}
+SEARCH_TYPE_FIELDS = {
+    "all":   ("project_title", "guide_name"),
+    "title": ("project_title",),
+    "guide": ("guide_name",),
+}
+
+K1 = 1.2
+B  = 0.75
+
+TOKEN_RE  = re.compile(r"[a-z0-9]+")
+STOPWORDS = frozenset("""
+    a an and are as at be but by for from has have in into is it its of on or
+    that the their this to was were will with
+""".split())
+
+
+def stem(token: str) -> str:
+    """
+    Light suffix stripping so ``systems`` matches ``system`` and ``learning``
+    matches ``learn``.  Only an approximation of Postgres' english snowball
+    stemmer – query and documents go through the same function.
+    """
+    if len(token) <= 3 or token.isdigit():
+        return token
+    if token.endswith("ies") and len(token) > 4:
+        return token[:-3] + "y"
+    if token.endswith("sses"):
+        return token[:-2]
+    for suffix in ("ing", "ed"):
+        if token.endswith(suffix) and len(token) - len(suffix) >= 3:
+            return token[:-len(suffix)]
+    if token.endswith("s") and not token.endswith(("ss", "us", "is")):
+        return token[:-1]
+    return token
+
+
+def tokenize(value: Optional[str]) -> List[str]:
+    return [stem(t) for t in TOKEN_RE.findall((value or "").lower()) if t not in STOPWORDS]
+
+
+def as_text(column: str, value) -> Optional[str]:
+    """A row value the way the SQL projection returns it (ARRAY → 'a, b')."""
+    if value is None:
+        return "" if column in OPTIONAL_COLUMNS else None
+    if isinstance(value, (list, tuple)):
+        return ", ".join(str(v) for v in value)
+    return str(value)
+
+
+class Document:
+    """One searchable row of a year table."""
+
+    __slots__ = ("table", "project_year", "group_no", "values", "lengths")
+
+    def __init__(self, table: str, values: Tuple[Optional[str], ...], lengths: Dict[str, int]):
+        self.table        = table
+        self.project_year = table.replace("_", "-")      # hyphen format for the UI
+        self.group_no     = values[0] or ""
+        self.values       = values                       # DOCUMENT_COLUMNS order
+        self.lengths      = lengths                      # field → token count
+
+    def get(self, column: str) -> Optional[str]:
+        return self.values[DOCUMENT_COLUMNS.index(column)]
+
+
+class Postings:
+    """Doc ids (ascending) and term frequencies of one term in one field."""
+
+    __slots__ = ("ids", "tfs")
+
+    def __init__(self):
+        self.ids = array("I")
+        self.tfs = array("H")
+
+    def add(self, doc_id: int, tf: int) -> None:
+        # ids only grow, so appending keeps the array sorted
+        self.ids.append(doc_id)
+        self.tfs.append(min(tf, 0xFFFF))
+
+    def remove(self, doc_id: int) -> None:
+        pos = bisect_left(self.ids, doc_id)
+        if pos < len(self.ids) and self.ids[pos] == doc_id:
+            del self.ids[pos]
+            del self.tfs[pos]
+
+
+Hit = Tuple[float, Document]
+
+
+class BM25Index:
+    """
+    In-memory inverted index over every year table, ranked with BM25F: term
+    frequencies of project_title and guide_name are length-normalised per
+    field and weighted like ``search_vector`` (title > guide).  Like
+    ``plainto_tsquery`` every query term must match.  Rows are added and
+    removed one at a time as the admin edits them.
+    """
+
+    def __init__(self, k1: float = K1, b: float = B):
+        self.k1 = k1
+        self.b  = b
+        self._postings: Dict[str, Dict[str, Postings]] = {f: {} for f in FIELD_WEIGHTS}
+        self._total_length: Dict[str, int] = {f: 0 for f in FIELD_WEIGHTS}
+        self._docs: Dict[int, Document] = {}
+        self._rows: Dict[Tuple[str, str], List[int]] = {}        # (table, group) → ids
+        self._next_id = 0
+        self.ready    = False
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    # ── maintenance ─────────────────────────────────────────────────────────────
+    def _add(self, table: str, record: Mapping[str, object]) -> None:
+        values  = tuple(as_text(c, record.get(c)) for c in DOCUMENT_COLUMNS)
+        doc_id  = self._next_id
+        self._next_id += 1
+        lengths = {}
+        for field in FIELD_WEIGHTS:
+            tokens = tokenize(values[DOCUMENT_COLUMNS.index(field)])
+            lengths[field] = len(tokens)
+            self._total_length[field] += len(tokens)
+            postings = self._postings[field]
+            for term, tf in Counter(tokens).items():
+                entry = postings.get(term)
+                if entry is None:
+                    entry = postings[term] = Postings()
+                entry.add(doc_id, tf)
+        doc = self._docs[doc_id] = Document(table, values, lengths)
+        self._rows.setdefault((table, doc.group_no), []).append(doc_id)
+
+    def upsert_row(self, table: str, record: Mapping[str, object]) -> None:
+        self.delete_row(table, record.get("group_no"))
+        self._add(table, record)
+
+    def delete_row(self, table: str, group_no) -> None:
+        for doc_id in self._rows.pop((table, str(group_no)), []):
+            doc = self._docs.pop(doc_id)
+            for field in FIELD_WEIGHTS:
+                self._total_length[field] -= doc.lengths[field]
+                postings = self._postings[field]
+                for term in set(tokenize(doc.get(field))):
+                    entry = postings[term]
+                    entry.remove(doc_id)
+                    if not entry.ids:
+                        del postings[term]
+
+    def drop_table(self, table: str) -> None:
+        for key in [k for k in self._rows if k[0] == table]:
+            self.delete_row(*key)
+
+    def replace_table(self, table: str, records: Iterable[Mapping[str, object]]) -> None:
+        """Swap in every row of a table (mappings of column → value)."""
+        self.drop_table(table)
+        for record in records:
+            self._add(table, record)
+
+    # ── lookup ──────────────────────────────────────────────────────────────────
+    def search(
+        self,
+        query: str,
+        tables: Optional[Iterable[str]] = None,
+        search_type: str = "all"
+    ) -> List[Hit]:
+        """
+        Every matching document as ``(rank, doc)``, ordered like the SQL
+        path: rank desc, project_year, group_no.
+        """
+        terms  = list(dict.fromkeys(tokenize(query)))
+        fields = SEARCH_TYPE_FIELDS.get(search_type, SEARCH_TYPE_FIELDS["all"])
+        if not terms or not self._docs:
+            return []
+
+        # per term: doc id → BM25F-weighted frequency over the searched fields
+        weighted: List[Dict[int, float]] = []
+        for term in terms:
+            freqs: Dict[int, float] = {}
+            for field in fields:
+                entry = self._postings[field].get(term)
+                if entry is None:
+                    continue
+                avg_len = self._total_length[field] / len(self._docs) or 1.0
+                weight  = FIELD_WEIGHTS[field]
+                for doc_id, tf in zip(entry.ids, entry.tfs):
+                    norm = 1 - self.b + self.b * self._docs[doc_id].lengths[field] / avg_len
+                    freqs[doc_id] = freqs.get(doc_id, 0.0) + weight * tf / norm
+            if not freqs:
+                return []
+            weighted.append(freqs)
+
+        # AND semantics: start from the rarest term
+        weighted.sort(key=len)
+        matches = set(weighted[0])
+        for freqs in weighted[1:]:
+            matches &= freqs.keys()
+
+        tables = set(tables) if tables is not None else None
+        n_docs = len(self._docs)
+        hits: List[Hit] = []
+        for doc_id in matches:
+            doc = self._docs[doc_id]
+            if tables is not None and doc.table not in tables:
+                continue
+            score = 0.0
+            for freqs in weighted:
+                idf    = math.log(1 + (n_docs - len(freqs) + 0.5) / (len(freqs) + 0.5))
+                tf     = freqs[doc_id]
+                score += idf * tf * (self.k1 + 1) / (tf + self.k1)
+            hits.append((round(score, 6), doc))
+
+        hits.sort(key=lambda h: (-h[0], h[1].project_year, h[1].group_no))
+        return hits
+
+
+def facet_counts(docs: Sequence[Document], guides: int = 10) -> Dict[str, List[dict]]:
+    """Hits per project_year and the ``guides`` most frequent guides."""
+    years = Counter(d.project_year for d in docs)
+    names = Counter(d.get("guide_name") for d in docs if d.get("guide_name"))
+    return {
+        "years":  [{"value": y, "count": n} for y, n in sorted(years.items())],
+        "guides": [{"value": g, "count": n}
+                   for g, n in sorted(names.items(), key=lambda item: (-item[1], item[0]))[:guides]],
+    }
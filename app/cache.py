@@ -0,0 +1,123 @@
+import hashlib
+import os
+import secrets
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Callable, Hashable, Optional
+
+
+SEARCH_CACHE_SIZE = int(os.getenv("SEARCH_CACHE_SIZE", "1024"))
+SEARCH_CACHE_TTL  = float(os.getenv("SEARCH_CACHE_TTL", "300"))
+
+
+class DataVersion:
+    """
+    Version of the searchable data.  Cache keys and ETags include ``value``,
+    so one bump makes every cached response stale at once.
+
+    Admin mutations bump it directly.  Changes this process cannot see – other
+    workers, ``python -m app.migrate_partitions``, manual SQL – are picked up
+    by ``observe()``, fed with the database's write counters (see
+    app.database.watch_data_version).  The value starts with a per-boot
+    nonce, so an ETag from before a restart or from another worker never
+    matches and never earns a stale 304.
+    """
+
+    def __init__(self):
+        self.nonce   = secrets.token_hex(4)
+        self.counter = 0
+        self._fingerprint: Optional[Hashable] = None
+
+    @property
+    def value(self) -> str:
+        return f"{self.nonce}.{self.counter}"
+
+    def bump(self) -> None:
+        self.counter += 1
+
+    @contextmanager
+    def changing(self):
+        """
+        Wrap the in-memory index refresh that follows a write: bumped before,
+        so cached SQL answers go stale at once, and again after, so nothing
+        answered from the half-refreshed indexes stays cached as current.
+        """
+        self.bump()
+        try:
+            yield
+        finally:
+            self.bump()
+
+    def observe(self, fingerprint: Hashable) -> bool:
+        """Bump if the database's write fingerprint moved since the last call."""
+        changed = self._fingerprint is not None and fingerprint != self._fingerprint
+        self._fingerprint = fingerprint
+        if changed:
+            self.bump()
+        return changed
+
+
+class TTLCache:
+    """Small LRU cache whose entries also expire after ``ttl`` seconds."""
+
+    def __init__(
+        self,
+        maxsize: int = SEARCH_CACHE_SIZE,
+        ttl: float = SEARCH_CACHE_TTL,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.maxsize = maxsize
+        self.ttl     = ttl
+        self.clock   = clock
+        self.hits    = 0
+        self.misses  = 0
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._data.get(key)
+        if entry is None or entry[0] <= self.clock():
+            if entry is not None:
+                del self._data[key]
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        self._data[key] = (self.clock() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+
+def normalize_query(q: str) -> str:
+    """Searches are case-insensitive, so 'ML  Model' and 'ml model' share a key."""
+    return " ".join(q.lower().split())
+
+
+def make_etag(*parts: Hashable) -> str:
+    """Strong ETag for a response fully determined by ``parts``."""
+    return '"%s"' % hashlib.sha1(repr(parts).encode()).hexdigest()[:32]
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Weak comparison, as If-None-Match requires: ``W/"x"`` (what a compressed
+    response carries, see app.compression) matches ``"x"``.
+    """
+    if not if_none_match:
+        return False
+    candidates = [c.strip().removeprefix("W/") for c in if_none_match.split(",")]
+    return "*" in candidates or etag.removeprefix("W/") in candidates
+
+
+data_version   = DataVersion()
+response_cache = TTLCache()
@@ -0,0 +1,148 @@
+import asyncio
+import os
+import re
+import time
+from typing import Callable, Dict, List, Optional, Set
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+SAFE_TABLE_RE = re.compile(r"^[A-Za-z0-9_]{1,63}$")      # backend + frontend rule
+SIGNATURE_TABLE = "title_signatures"                     # see app.duplicates
+BLOCKLIST     = {"alembic_version", SIGNATURE_TABLE}     # skip system tables
+
+# Import staging tables and the kept previous version of a re-imported table
+STAGING_SUFFIX  = "__staging"
+PREVIOUS_SUFFIX = "__previous"
+SHADOW_SUFFIXES = (STAGING_SUFFIX, PREVIOUS_SUFFIX)
+
+# Fallback for DDL that happens behind the app's back (psql, migrations …)
+SCHEMA_CACHE_TTL = float(os.getenv("SCHEMA_CACHE_TTL", "300"))
+
+
+def is_shadow_table(table_name: str) -> bool:
+    return table_name.endswith(SHADOW_SUFFIXES)
+
+
+class SchemaCatalog:
+    """
+    In-process copy of the year tables and their columns.
+
+    Loaded with a single catalog query on first use and then served from
+    memory.  The admin router calls ``invalidate()`` whenever it changes the
+    schema; the TTL only covers changes made outside the app.
+    """
+
+    def __init__(self, ttl: float = SCHEMA_CACHE_TTL):
+        self.ttl         = ttl
+        self._columns: Dict[str, Dict[str, str]] = {}
+        self._generated: Dict[str, Set[str]] = {}
+        self._parents: Dict[str, str] = {}                 # partition → parent
+        self._partitioned: Set[str] = set()                # partitioned parents
+        self._loaded_at: Optional[float] = None
+        self._generation = 0
+        self._lock: Optional[asyncio.Lock] = None
+        self._listeners: List[Callable[[], None]] = []
+        self.version     = 0                               # bumped on every (re)load
+
+    # ── public API ──────────────────────────────────────────────────────────────
+    async def year_tables(self, db: AsyncSession) -> List[str]:
+        """
+        Sorted table names (underscore form) that qualify as year tables –
+        plain tables and partitions, but not the partitioned parent itself.
+        """
+        await self._ensure_loaded(db)
+        return sorted(t for t in self._columns if t not in self._partitioned)
+
+    async def columns(self, db: AsyncSession, table_name: str) -> Dict[str, str]:
+        """``{column: data_type}`` for one table – empty if it is unknown."""
+        await self._ensure_loaded(db)
+        return dict(self._columns.get(table_name, {}))
+
+    async def generated_columns(self, db: AsyncSession, table_name: str) -> Set[str]:
+        """Columns Postgres computes itself (``GENERATED ALWAYS … STORED``)."""
+        await self._ensure_loaded(db)
+        return set(self._generated.get(table_name, ()))
+
+    async def partition_parents(self, db: AsyncSession) -> Dict[str, str]:
+        """``{partition: parent}`` for year tables stored as partitions."""
+        await self._ensure_loaded(db)
+        return dict(self._parents)
+
+    def invalidate(self) -> None:
+        """Drop the cached schema; the next lookup reloads it."""
+        self._generation += 1
+        self._loaded_at   = None
+        for listener in self._listeners:
+            listener()
+
+    def add_listener(self, callback: Callable[[], None]) -> None:
+        """Call ``callback()`` whenever the schema is invalidated."""
+        self._listeners.append(callback)
+
+    # ── loading ─────────────────────────────────────────────────────────────────
+    def _is_fresh(self) -> bool:
+        return (
+            self._loaded_at is not None
+            and time.monotonic() - self._loaded_at < self.ttl
+        )
+
+    async def _ensure_loaded(self, db: AsyncSession) -> None:
+        if self._is_fresh():
+            return
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if self._is_fresh():                  # another request loaded it
+                return
+            generation = self._generation
+            (
+                self._columns, self._generated, self._parents, self._partitioned
+            ) = await self._load(db)
+            self.version += 1
+            # invalidated while loading → serve it once, reload next time
+            if generation == self._generation:
+                self._loaded_at = time.monotonic()
+
+    @staticmethod
+    async def _load(db: AsyncSession):
+        query = text(
+            """
+            SELECT c.table_name, c.column_name, c.data_type, c.is_generated,
+                   t.relkind, parent.relname
+            FROM   information_schema.columns c
+            JOIN   pg_class t
+              ON   t.relname      = c.table_name
+             AND   t.relnamespace = 'public'::regnamespace
+             AND   t.relkind IN ('r', 'p')
+            LEFT JOIN pg_inherits i  ON i.inhrelid  = t.oid
+            LEFT JOIN pg_class parent ON parent.oid = i.inhparent
+            WHERE  c.table_schema = 'public'
+            ORDER  BY c.table_name, c.ordinal_position
+            """
+        )
+        result = await db.execute(query)
+
+        columns: Dict[str, Dict[str, str]] = {}
+        generated: Dict[str, Set[str]] = {}
+        parents: Dict[str, str] = {}
+        partitioned: Set[str] = set()
+        for table_name, column_name, data_type, is_generated, relkind, parent in result:
+            if (
+                not SAFE_TABLE_RE.match(table_name)
+                or table_name in BLOCKLIST
+                or is_shadow_table(table_name)
+            ):
+                continue
+            columns.setdefault(table_name, {})[column_name] = data_type
+            if is_generated == "ALWAYS":
+                generated.setdefault(table_name, set()).add(column_name)
+            if relkind == "p":
+                partitioned.add(table_name)
+            if parent is not None:
+                parents[table_name] = parent
+        return columns, generated, parents, partitioned
+
+
+schema_catalog = SchemaCatalog()
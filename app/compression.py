@@ -0,0 +1,139 @@
+import gzip
+import os
+import zlib
+from typing import Optional
+
+try:                                             # optional, ~20% smaller than gzip
+    import brotli
+except ImportError:                              # pragma: no cover – gzip only
+    brotli = None
+
+
+COMPRESS_MIN_SIZE = int(os.getenv("COMPRESS_MIN_SIZE", "1024"))     # bytes, smaller bodies go as-is
+GZIP_LEVEL        = int(os.getenv("GZIP_LEVEL", "6"))
+BROTLI_QUALITY    = int(os.getenv("BROTLI_QUALITY", "5"))            # per response; assets use 11
+
+COMPRESSIBLE_TYPES = (
+    "application/json", "application/x-ndjson", "application/javascript",
+    "text/", "image/svg+xml",
+)
+
+
+def is_compressible(content_type: str) -> bool:
+    return content_type.split(";")[0].strip().lower().startswith(COMPRESSIBLE_TYPES)
+
+
+def choose_encoding(accept_encoding: Optional[str], allow_brotli: bool = True) -> Optional[str]:
+    """``"br"``, ``"gzip"`` or None for an Accept-Encoding header (q=0 honoured)."""
+    accepted = {}
+    for part in (accept_encoding or "").lower().split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        if params.strip().startswith("q="):
+            try:
+                q = float(params.strip()[2:])
+            except ValueError:
+                q = 0.0
+        accepted[name.strip()] = q
+    if allow_brotli and brotli is not None and accepted.get("br", 0) > 0:
+        return "br"
+    if accepted.get("gzip", accepted.get("*", 0)) > 0:
+        return "gzip"
+    return None
+
+
+def compress(body: bytes, encoding: str, level: Optional[int] = None) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY if level is None else level)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL if level is None else level, mtime=0)
+
+
+def weak_etag(etag: bytes) -> bytes:
+    """The compressed body is a different representation – only weakly equal."""
+    return etag if etag.startswith(b"W/") else b"W/" + etag
+
+
+def stream_chunk(stream, chunk: bytes, more_body: bool) -> bytes:
+    """
+    Compress one chunk of a streamed body and flush it out: a sync flush
+    after every chunk, so each one reaches the client as it is produced
+    instead of waiting in the compressor until the body ends.
+    """
+    return stream.compress(chunk) + stream.flush(zlib.Z_SYNC_FLUSH if more_body else zlib.Z_FINISH)
+
+
+class CompressionMiddleware:
+    """
+    Pure ASGI middleware: gzip/brotli for compressible responses of at least
+    COMPRESS_MIN_SIZE bytes when the client accepts it.  Whole bodies are
+    compressed in one go; streamed ones (e.g. table exports) chunk by chunk
+    with gzip, each chunk flushed as it arrives.  Responses that already carry a Content-Encoding – the
+    precompressed static assets – pass through untouched.
+    """
+
+    def __init__(self, app, minimum_size: int = COMPRESS_MIN_SIZE):
+        self.app          = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accept   = dict(scope.get("headers", [])).get(b"accept-encoding", b"").decode("latin-1")
+        encoding = choose_encoding(accept)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start: Optional[dict] = None
+        stream = None                            # zlib compressobj once streaming
+
+        async def send_compressed(message):
+            nonlocal start, stream, encoding
+            if message["type"] == "http.response.start":
+                start = message                  # held until the first body chunk
+                return
+            if message["type"] == "http.response.body" and stream is not None:
+                more_body = message.get("more_body", False)
+                await send({**message, "body": stream_chunk(stream, message.get("body", b""), more_body)})
+                return
+            if message["type"] != "http.response.body" or start is None:
+                await send(message)
+                return
+
+            body      = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            headers  = [(k.lower(), v) for k, v in start.get("headers", [])]
+            names    = {k for k, _ in headers}
+            eligible = (
+                b"content-encoding" not in names
+                and start["status"] not in (204, 206, 304)   # 206: a range of the identity body
+                and is_compressible(dict(headers).get(b"content-type", b"").decode("latin-1"))
+                and (more_body or len(body) >= self.minimum_size)
+            )
+            if eligible and more_body:
+                # brotli has no stdlib streaming API
+                encoding = choose_encoding(accept, allow_brotli=False)
+                eligible = encoding is not None
+            if not eligible:
+                await send(start)
+                start = None
+                await send(message)
+                return
+
+            headers = [(k, v) for k, v in headers if k != b"content-length"]
+            headers = [(k, weak_etag(v) if k == b"etag" else v) for k, v in headers]
+            headers += [(b"content-encoding", encoding.encode()), (b"vary", b"Accept-Encoding")]
+            if more_body:
+                stream = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+                body   = stream_chunk(stream, body, more_body)
+            else:
+                body = compress(body, encoding)
+                headers.append((b"content-length", str(len(body)).encode()))
+            await send({**start, "headers": headers})
+            start = None
+            await send({**message, "body": body})
+
+        await self.app(scope, receive, send_compressed)
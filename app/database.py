@@ -1,12 +1,142 @@
+import asyncio
+import logging
 import os
+import time
+from typing import Optional
 
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from dotenv import load_dotenv
+load_dotenv()
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine, AsyncSession
 from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.cache import data_version
+from app.catalog import schema_catalog
+from app.metrics import WaitStats
 
 Base = declarative_base()
-engine = create_async_engine(os.getenv("DATABASE_URL"))
+
+
+def env_bool(name: str, default: str = "false") -> bool:
+    return os.getenv(name, default).strip().lower() in ("1", "true", "yes", "on")
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# Pool settings – size them as workers × (DB_POOL_SIZE + DB_MAX_OVERFLOW)
+# ≤ the server's max_connections
+# ────────────────────────────────────────────────────────────────────────────────
+DATABASE_URL            = os.getenv("DATABASE_URL") or os.getenv("ASYNC_DB_URL")
+DB_POOL_SIZE            = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW         = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT         = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE         = int(os.getenv("DB_POOL_RECYCLE", "1800"))      # seconds, -1 = never
+DB_STATEMENT_CACHE_SIZE = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "100"))  # asyncpg, per connection
+# prepared statements SQLAlchemy keeps per connection – one per query shape
+# (tables × search type × first/next page), see app.statements
+DB_PREPARED_STATEMENT_CACHE_SIZE = int(os.getenv("DB_PREPARED_STATEMENT_CACHE_SIZE", "256"))
+DB_ECHO                 = env_bool("DB_ECHO")
+
+# Seconds between checks for writes made outside this process (0 = off)
+DATA_VERSION_POLL       = float(os.getenv("DATA_VERSION_POLL", "10"))
+
+# Time spent waiting for a pooled connection (see /api/admin/pool-stats)
+pool_wait = WaitStats()
+
+
+class MeteredQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long each checkout waited."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except Exception:
+            pool_wait.record(time.perf_counter() - start, error=True)
+            raise
+        pool_wait.record(time.perf_counter() - start)
+        return conn
+
+
+def make_engine(url: Optional[str] = None) -> AsyncEngine:
+    """
+    The app's single async engine.  Every router, the importer and the CLI
+    scripts share it, so one worker holds one pool.
+    """
+    return create_async_engine(
+        url or DATABASE_URL,
+        echo=DB_ECHO,
+        poolclass=MeteredQueuePool,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+        connect_args={
+            "statement_cache_size": DB_STATEMENT_CACHE_SIZE,
+            "prepared_statement_cache_size": DB_PREPARED_STATEMENT_CACHE_SIZE,
+            "server_settings": {
+                # minimum word similarity for search_type=fuzzy (0..1)
+                "pg_trgm.word_similarity_threshold": os.getenv("FUZZY_THRESHOLD", "0.5"),
+            },
+        },
+    )
+
+
+def pool_stats(engine: AsyncEngine) -> dict:
+    pool = engine.pool
+    return {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "idle": pool.checkedin(),
+        "overflow": max(0, pool.overflow()),
+        "max_overflow": DB_MAX_OVERFLOW,
+        "timeout_seconds": DB_POOL_TIMEOUT,
+        "wait": pool_wait.snapshot(),
+    }
+
+
+# Statement logging follows DB_ECHO even when the app logs at DEBUG
+logging.getLogger("sqlalchemy.engine").setLevel(logging.INFO if DB_ECHO else logging.WARNING)
+
+def invalidate_prepared_statements(engine: AsyncEngine) -> None:
+    """Make every pooled connection re-prepare its statements on next use."""
+    invalidate = getattr(engine.dialect, "_invalidate_schema_cache", None)
+    if invalidate is not None:                   # asyncpg dialect, SQLAlchemy 2.0
+        invalidate()
+
+
+engine = make_engine()
+schema_catalog.add_listener(lambda: invalidate_prepared_statements(engine))
 async_session = sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
 
+# Rows written to and tables in the database, per the statistics system
+WRITE_FINGERPRINT_SQL = text(
+    "SELECT COALESCE(sum(n_tup_ins + n_tup_upd + n_tup_del), 0), count(*) FROM pg_stat_user_tables"
+)
+
+
+async def watch_data_version(interval: float = DATA_VERSION_POLL) -> None:
+    """
+    Bump ``data_version`` whenever the database saw writes – including ones
+    this worker did not make itself: other workers' admin edits, the
+    partition migration CLI, manual SQL – and drop the schema catalog when
+    tables appeared or vanished.  Runs for the app's lifetime.
+    """
+    tables = None
+    while True:
+        try:
+            async with engine.connect() as conn:
+                fingerprint = tuple((await conn.execute(WRITE_FINGERPRINT_SQL)).one())
+            data_version.observe(fingerprint)
+            if tables is not None and fingerprint[1] != tables:
+                schema_catalog.invalidate()      # tables created / dropped elsewhere
+            tables = fingerprint[1]
+        except Exception as exc:                 # noqa: BLE001 – keep watching
+            print(f"[data-version] poll failed: {exc}")
+        await asyncio.sleep(interval)
+
+
 async def get_db():
     async with async_session() as session:
-        yield session
\ No newline at end of file
+        yield session
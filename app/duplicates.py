@@ -0,0 +1,152 @@
+import asyncio
+import os
+from typing import Dict, Iterable, List, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+from app.catalog import SIGNATURE_TABLE, schema_catalog
+from app.minhash import LSHIndex, Signature, normalize_title, signature
+
+
+# Estimated trigram Jaccard similarity from which two titles are reported
+DUPLICATE_THRESHOLD = float(os.getenv("DUPLICATE_THRESHOLD", "0.6"))
+MAX_MATCHES         = 5          # earlier projects listed per new title
+
+# MinHash signatures keyed by normalised title: a changed title gets a new
+# key, and keys no year table uses any more are pruned by duplicate_report()
+CREATE_SIGNATURE_TABLE = f"""
+    CREATE TABLE IF NOT EXISTS {SIGNATURE_TABLE} (
+        title     TEXT PRIMARY KEY,
+        signature BIGINT[] NOT NULL
+    )
+"""
+
+
+async def create_signature_table(conn: AsyncConnection) -> None:
+    """Run once at startup, next to the ORM tables."""
+    await conn.execute(text(CREATE_SIGNATURE_TABLE))
+
+
+async def _titles(db: AsyncSession, table_name: str) -> List[Tuple[str, str]]:
+    """``(group_no, project_title)`` of one year table."""
+    columns = await schema_catalog.columns(db, table_name)
+    if not {"group_no", "project_title"} <= set(columns):
+        return []
+    result = await db.execute(text(
+        f'SELECT group_no::text, project_title FROM "{table_name}" '
+        f"WHERE COALESCE(project_title, '') <> ''"
+    ))
+    return [(group_no, title) for group_no, title in result]
+
+
+def _sign(titles: List[str]) -> Dict[str, Signature]:
+    signatures = {}
+    for title in titles:
+        sig = signature(title)
+        if sig is not None:
+            signatures[title] = sig
+    return signatures
+
+
+async def _signatures(db: AsyncSession, titles: Iterable[str]) -> Dict[str, Signature]:
+    """
+    Signatures of normalised ``titles``: stored ones are read back, missing
+    ones computed and stored for the next import.
+    """
+    titles = sorted(set(titles))
+    result = await db.execute(
+        text(f"SELECT title, signature FROM {SIGNATURE_TABLE} WHERE title = ANY(:titles)"),
+        {"titles": titles},
+    )
+    known = {title: tuple(sig) for title, sig in result}
+
+    # hashing every title of a fresh deploy takes seconds – not on the event loop
+    computed = await asyncio.to_thread(_sign, [title for title in titles if title not in known])
+    known.update(computed)
+    missing = [{"title": title, "signature": list(sig)} for title, sig in computed.items()]
+    if missing:
+        await db.execute(
+            text(
+                f"INSERT INTO {SIGNATURE_TABLE} (title, signature) VALUES (:title, :signature) "
+                f"ON CONFLICT (title) DO NOTHING"
+            ),
+            missing,
+        )
+    await db.commit()
+    return known
+
+
+async def _prune_signatures(db: AsyncSession, keep: Iterable[str]) -> None:
+    """Drop signatures of titles that no year table contains any more."""
+    await db.execute(
+        text(f"DELETE FROM {SIGNATURE_TABLE} WHERE title <> ALL(:keep)"),
+        {"keep": sorted(set(keep))},
+    )
+    await db.commit()
+
+
+def _match(
+    new_rows: List[Tuple[str, str]],
+    existing: List[Tuple[str, str, str]],
+    signatures: Dict[str, Signature],
+    threshold: float
+) -> List[dict]:
+    """LSH build and lookups of duplicate_report(), run in a worker thread."""
+    index = LSHIndex()
+    for other, group_no, title in existing:
+        sig = signatures.get(normalize_title(title))
+        if sig is not None:
+            index.add((other, group_no, title), sig)
+
+    report = []
+    for group_no, title in new_rows:
+        sig = signatures.get(normalize_title(title))
+        if sig is None:
+            continue
+        matches = index.query(sig, threshold)[:MAX_MATCHES]
+        if matches:
+            report.append({
+                "group_no": group_no,
+                "project_title": title,
+                "matches": [
+                    {
+                        "project_year": other.replace("_", "-"),
+                        "group_no": other_group,
+                        "project_title": other_title,
+                        "similarity": round(score, 3),
+                    }
+                    for (other, other_group, other_title), score in matches
+                ],
+            })
+    return report
+
+
+async def duplicate_report(
+    db: AsyncSession,
+    table_name: str,
+    threshold: float = DUPLICATE_THRESHOLD
+) -> List[dict]:
+    """
+    Titles of ``table_name`` that (nearly) repeat a project of another year
+    table.  Earlier titles go into an LSH index, then each new title only
+    checks the entries it shares a band with – no N×M comparison.
+    """
+    new_rows = await _titles(db, table_name)
+    existing = []
+    for other in await schema_catalog.year_tables(db):
+        if other != table_name:
+            existing += [(other, group_no, title) for group_no, title in await _titles(db, other)]
+    if not new_rows or not existing:
+        return []
+
+    # every title of every year table – what the signature table should hold
+    titles = (
+        [normalize_title(title) for _, title in new_rows]
+        + [normalize_title(title) for _, _, title in existing]
+    )
+    signatures = await _signatures(db, titles)
+    await _prune_signatures(db, titles)
+
+    return await asyncio.to_thread(_match, new_rows, existing, signatures, threshold)
+
@@ -0,0 +1,272 @@
+import asyncio
+import logging
+import os
+from itertools import islice
+from typing import AsyncIterator, Callable, Iterable, List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from app.catalog import PREVIOUS_SUFFIX, STAGING_SUFFIX
+from app.indexes import (
+    INDEX_SUFFIXES, SEARCH_VECTOR_EXPR, index_name,
+    search_index_statements, trigram_index_statements,
+)
+from app.metrics import timed_import
+from app.spreadsheet import TABLE_COLUMNS, SpreadsheetError
+
+logger = logging.getLogger(__name__)
+
+COPY_BATCH_SIZE = 500            # records per COPY round trip
+
+SWAP_LOCK_TIMEOUT = "5s"         # max wait for the live table's lock when swapping
+
+Progress = Optional[Callable[[str, int], None]]     # (phase, rows_processed)
+
+# "tables": one table per academic year (default).  "partitioned": imports
+# become LIST partitions of PARTITIONED_TABLE keyed by project_year, so a
+# cross-year search is one query on the parent.  Existing year tables are
+# folded in with `python -m app.migrate_partitions`.
+STORAGE_MODE      = os.getenv("STORAGE_MODE", "tables")
+PARTITIONED_TABLE = "projects"
+
+
+def create_table_sql(table_name: str) -> str:
+    """
+    Year table as produced by an import.  ``search_vector`` is a stored
+    generated column, so COPY fills it in the same pass as the data.
+    """
+    columns = ",\n            ".join(f"{c} TEXT" for c in TABLE_COLUMNS)
+    return f"""
+        CREATE TABLE "{table_name}" (
+            {columns},
+            search_vector tsvector GENERATED ALWAYS AS ({SEARCH_VECTOR_EXPR}) STORED
+        )
+    """
+
+
+def create_parent_sql() -> str:
+    """The partitioned table holding every year (STORAGE_MODE=partitioned)."""
+    columns = ",\n            ".join(f"{c} TEXT" for c in TABLE_COLUMNS)
+    return f"""
+        CREATE TABLE IF NOT EXISTS {PARTITIONED_TABLE} (
+            project_year TEXT NOT NULL,
+            {columns},
+            search_vector tsvector GENERATED ALWAYS AS ({SEARCH_VECTOR_EXPR}) STORED
+        ) PARTITION BY LIST (project_year)
+    """
+
+
+def create_partition_statements(staging: str, year: str) -> List[str]:
+    """
+    A detached table shaped like the parent, ready to be attached as the
+    ``year`` partition.  The default lets COPY/INSERT omit project_year and
+    the CHECK lets ATTACH PARTITION skip its validation scan.
+    """
+    return [
+        f'CREATE TABLE "{staging}" '
+        f"(LIKE {PARTITIONED_TABLE} INCLUDING DEFAULTS INCLUDING GENERATED)",
+        f"ALTER TABLE \"{staging}\" ALTER COLUMN project_year SET DEFAULT '{year}'",
+        f"ALTER TABLE \"{staging}\" ADD CHECK (project_year = '{year}')",
+    ]
+
+
+async def create_search_indexes(conn: AsyncConnection, table_name: str) -> None:
+    """GIN indexes for every search mode on a table with a generated search_vector."""
+    for stmt in search_index_statements(table_name, generate=False):
+        await conn.execute(text(stmt))
+
+    # trigram indexes for fuzzy search; optional if pg_trgm is missing
+    try:
+        async with conn.begin_nested():
+            for stmt in trigram_index_statements(table_name):
+                await conn.execute(text(stmt))
+    except Exception as e:
+        logger.warning(f"   ⚠️ Fuzzy search indexes not created for {table_name}: {e}")
+
+
+async def ensure_partitioned_parent(conn: AsyncConnection) -> None:
+    await conn.execute(text(create_parent_sql()))
+    await create_search_indexes(conn, PARTITIONED_TABLE)
+
+
+async def batches_in_thread(
+    records: Iterable[Tuple],
+    size: int = COPY_BATCH_SIZE
+) -> AsyncIterator[List[Tuple]]:
+    """
+    Pull ``records`` (a blocking parser generator) ``size`` at a time in a
+    worker thread so parsing never runs on the event loop.
+    """
+    records = iter(records)
+    while True:
+        batch = await asyncio.to_thread(lambda: list(islice(records, size)))
+        if not batch:
+            return
+        yield batch
+
+
+async def copy_records(
+    conn: AsyncConnection,
+    table_name: str,
+    batches: AsyncIterator[List[Tuple]],
+    progress: Progress = None
+) -> int:
+    """
+    Bulk-load record batches with the asyncpg COPY protocol inside the
+    transaction already open on ``conn``.
+    """
+    raw    = await conn.get_raw_connection()
+    driver = raw.driver_connection
+    count  = 0
+    async for batch in batches:
+        await driver.copy_records_to_table(table_name, records=batch, columns=list(TABLE_COLUMNS))
+        count += len(batch)
+        if progress:
+            progress("loading", count)
+    return count
+
+
+async def table_exists(conn: AsyncConnection, table_name: str) -> bool:
+    result = await conn.execute(
+        text("SELECT to_regclass(:name) IS NOT NULL"), {"name": f'public."{table_name}"'}
+    )
+    return bool(result.scalar())
+
+
+async def partition_parent(conn: AsyncConnection, table_name: str) -> Optional[str]:
+    result = await conn.execute(
+        text(
+            """
+            SELECT parent.relname
+            FROM   pg_inherits i
+            JOIN   pg_class parent ON parent.oid = i.inhparent
+            WHERE  i.inhrelid = to_regclass(:name)
+            """
+        ),
+        {"name": f'public."{table_name}"'},
+    )
+    return result.scalar()
+
+
+async def rename_table(conn: AsyncConnection, old: str, new: str) -> None:
+    """Rename a year table together with its idx_<table>_* search indexes."""
+    await conn.execute(text(f'ALTER TABLE "{old}" RENAME TO "{new}"'))
+    for suffix in INDEX_SUFFIXES:
+        await conn.execute(text(
+            f"ALTER INDEX IF EXISTS {index_name(old, suffix)} RENAME TO {index_name(new, suffix)}"
+        ))
+
+
+async def swap_in_staging(
+    conn: AsyncConnection,
+    table_name: str,
+    parent: Optional[str] = None
+) -> None:
+    """
+    staging → live, live → previous, inside the caller's transaction.  Only
+    renames (plus detach/attach when ``parent`` is set), so the exclusive
+    lock on the live table is held for milliseconds; ``lock_timeout`` stops
+    the swap from queueing behind a long query (and every new search from
+    queueing behind the swap).
+    """
+    staging  = table_name + STAGING_SUFFIX
+    previous = table_name + PREVIOUS_SUFFIX
+
+    await conn.execute(text(f"SET LOCAL lock_timeout = '{SWAP_LOCK_TIMEOUT}'"))
+    await conn.execute(text(f'DROP TABLE IF EXISTS "{previous}"'))
+    if await table_exists(conn, table_name):
+        await detach_partition(conn, table_name)
+        await rename_table(conn, table_name, previous)
+    await rename_table(conn, staging, table_name)
+    if parent:
+        await attach_partition(conn, parent, table_name)
+
+
+async def detach_partition(conn: AsyncConnection, table_name: str) -> Optional[str]:
+    """Detach ``table_name`` if it is a partition; returns the former parent."""
+    parent = await partition_parent(conn, table_name)
+    if parent:
+        await conn.execute(text(f'ALTER TABLE "{parent}" DETACH PARTITION "{table_name}"'))
+    return parent
+
+
+async def attach_partition(conn: AsyncConnection, parent: str, table_name: str) -> None:
+    await conn.execute(text(
+        f'ALTER TABLE "{parent}" ATTACH PARTITION "{table_name}" '
+        f"FOR VALUES IN ('{table_name}')"
+    ))
+
+
+async def rollback_table(engine: AsyncEngine, table_name: str) -> None:
+    """Swap the live table with the version kept by the last import."""
+    previous = table_name + PREVIOUS_SUFFIX
+    swap     = table_name + STAGING_SUFFIX
+
+    async with engine.begin() as conn:
+        if not await table_exists(conn, previous):
+            raise LookupError(f"No previous version of {table_name} to roll back to")
+        await conn.execute(text(f"SET LOCAL lock_timeout = '{SWAP_LOCK_TIMEOUT}'"))
+        await conn.execute(text(f'DROP TABLE IF EXISTS "{swap}"'))
+        parent = await detach_partition(conn, table_name)
+        await rename_table(conn, table_name, swap)
+        await rename_table(conn, previous, table_name)
+        await rename_table(conn, swap, previous)
+        if parent:
+            await attach_partition(conn, parent, table_name)
+
+
+async def import_table(
+    engine: AsyncEngine,
+    table_name: str,
+    records: Iterable[Tuple],
+    progress: Progress = None
+) -> int:
+    """
+    Build ``<table>__staging`` from ``records``, index it, then swap it in by
+    renaming – searches keep hitting the old table until the very end and
+    never see a missing or half-loaded one.  The replaced table is kept as
+    ``<table>__previous`` for ``rollback_table``.  Everything runs in one
+    transaction, so any error leaves the live table untouched.
+
+    With STORAGE_MODE=partitioned the staging table is attached as the year's
+    partition of PARTITIONED_TABLE instead; the parent and its indexes are
+    created beforehand in a short transaction of their own, so the import
+    does not hold locks on the parent while it loads.
+
+    ``progress(phase, rows)`` is called as the import advances.  Returns the
+    number of groups imported.
+    """
+    staging     = table_name + STAGING_SUFFIX
+    partitioned = STORAGE_MODE == "partitioned"
+
+    if partitioned:
+        async with engine.begin() as conn:
+            await ensure_partitioned_parent(conn)
+
+    async with engine.begin() as conn:
+        with timed_import("staging"):
+            await conn.execute(text(f'DROP TABLE IF EXISTS "{staging}"'))
+            if partitioned:
+                for stmt in create_partition_statements(staging, table_name):
+                    await conn.execute(text(stmt))
+            else:
+                await conn.execute(text(create_table_sql(staging)))
+
+        # parsing runs in threads interleaved with COPY, so it is timed here too
+        with timed_import("loading"):
+            count = await copy_records(conn, staging, batches_in_thread(records), progress)
+        if not count:
+            raise SpreadsheetError("No valid data found in the uploaded file")
+
+        if progress:
+            progress("indexing", count)
+        with timed_import("indexing"):
+            await create_search_indexes(conn, staging)
+
+        if progress:
+            progress("swapping", count)
+        with timed_import("swapping"):
+            await swap_in_staging(conn, table_name, PARTITIONED_TABLE if partitioned else None)
+
+    return count
@@ -0,0 +1,80 @@
+import hashlib
+from typing import List
+
+from app.pagination import GROUP_NO_KEYS
+
+
+# Weighted document vector stored in ``search_vector`` (title > guide)
+SEARCH_VECTOR_EXPR = (
+    "setweight(to_tsvector('english', COALESCE(project_title, '')), 'A') || "
+    "setweight(to_tsvector('english', COALESCE(guide_name, '')), 'B')"
+)
+
+# Must stay byte-for-byte equivalent to the expressions used by the search and
+# suggestion queries, otherwise the planner cannot use the expression indexes.
+TITLE_TSVECTOR_EXPR = "to_tsvector('english', COALESCE(project_title, ''))"
+GUIDE_TSVECTOR_EXPR = "to_tsvector('english', COALESCE(guide_name, ''))"
+
+
+# Every idx_<table>_<suffix> the app creates (renamed along with the table)
+INDEX_SUFFIXES = ("search", "title_fts", "guide_fts", "title_trgm", "guide_trgm", "group_no")
+
+
+def index_name(table_name: str, suffix: str) -> str:
+    """
+    ``idx_<table>_<suffix>`` kept under Postgres' 63-byte identifier limit.
+    Long table names are shortened with a hash so that two indexes of the
+    same table can never truncate to the same name.
+    """
+    name = f"idx_{table_name}_{suffix}"
+    if len(name) <= 63:
+        return name
+    digest = hashlib.md5(table_name.encode()).hexdigest()[:8]
+    keep   = 63 - len(f"idx__{digest}_{suffix}")
+    return f"idx_{table_name[:keep]}_{digest}_{suffix}"
+
+
+def search_index_statements(table_name: str, generate: bool = True) -> List[str]:
+    """
+    Idempotent DDL that makes every search mode index-backed for one year
+    table: the weighted ``search_vector`` with its GIN index, plus expression
+    GIN indexes for title-only and guide-only search.  A B-tree on the
+    GROUP_NO_ORDER expressions serves the keyset-paginated admin pages.
+
+    With ``generate`` a plain (or missing) ``search_vector`` is replaced by a
+    stored generated column, so Postgres keeps it current on every INSERT
+    and UPDATE.  This rewrites the table once; pass ``generate=False`` when
+    the column is already generated.
+    """
+    statements = []
+    if generate:
+        statements += [
+            f'ALTER TABLE "{table_name}" DROP COLUMN IF EXISTS search_vector',
+            f'ALTER TABLE "{table_name}" ADD COLUMN search_vector tsvector '
+            f'GENERATED ALWAYS AS ({SEARCH_VECTOR_EXPR}) STORED',
+        ]
+    return statements + [
+        f'CREATE INDEX IF NOT EXISTS {index_name(table_name, "search")} '
+        f'ON "{table_name}" USING GIN (search_vector)',
+        f'CREATE INDEX IF NOT EXISTS {index_name(table_name, "title_fts")} '
+        f'ON "{table_name}" USING GIN ({TITLE_TSVECTOR_EXPR})',
+        f'CREATE INDEX IF NOT EXISTS {index_name(table_name, "guide_fts")} '
+        f'ON "{table_name}" USING GIN ({GUIDE_TSVECTOR_EXPR})',
+        f'CREATE INDEX IF NOT EXISTS {index_name(table_name, "group_no")} '
+        f'ON "{table_name}" (' + ", ".join(f"({key})" for key in GROUP_NO_KEYS) + ")",
+    ]
+
+
+def trigram_index_statements(table_name: str) -> List[str]:
+    """
+    pg_trgm GIN indexes for ``search_type=fuzzy``.  Kept apart from
+    ``search_index_statements`` because creating the extension needs extra
+    privileges and must not block an import when it is unavailable.
+    """
+    return [
+        "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+        f'CREATE INDEX IF NOT EXISTS {index_name(table_name, "title_trgm")} '
+        f'ON "{table_name}" USING GIN (project_title gin_trgm_ops)',
+        f'CREATE INDEX IF NOT EXISTS {index_name(table_name, "guide_trgm")} '
+        f'ON "{table_name}" USING GIN (guide_name gin_trgm_ops)',
+    ]
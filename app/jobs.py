@@ -0,0 +1,100 @@
+import asyncio
+import itertools
+import os
+import time
+import uuid
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Optional
+
+
+MAX_CONCURRENT_JOBS = int(os.getenv("MAX_CONCURRENT_IMPORTS", "1"))
+MAX_KEPT_JOBS       = 100        # finished jobs remembered for the status endpoint
+
+
+class Job:
+    """Progress record of one background admin job (e.g. an Excel import)."""
+
+    __slots__ = (
+        "id", "kind", "table", "phase", "rows_processed", "error",
+        "result", "created_at", "started_at", "finished_at",
+    )
+
+    def __init__(self, kind: str, table: str):
+        self.id             = uuid.uuid4().hex
+        self.kind           = kind
+        self.table          = table
+        self.phase          = "queued"
+        self.rows_processed = 0
+        self.error: Optional[str] = None
+        self.result: Optional[dict] = None
+        self.created_at     = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.phase in ("done", "failed")
+
+    def to_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__} | {
+            "finished": self.finished,
+        }
+
+
+class JobRunner:
+    """
+    Runs admin jobs as asyncio tasks next to the request handlers.  Jobs are
+    expected to push their blocking parts (spreadsheet parsing, file copies)
+    to threads with ``asyncio.to_thread`` so the event loop keeps serving
+    searches; the semaphore caps how many imports load the database at once.
+    """
+
+    def __init__(self, max_concurrent: int = MAX_CONCURRENT_JOBS, keep: int = MAX_KEPT_JOBS):
+        self.max_concurrent = max_concurrent
+        self.keep           = keep
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    def submit(self, kind: str, table: str, work: Callable[[Job], Awaitable[Optional[dict]]]) -> Job:
+        """Schedule ``work(job)``; it updates ``job.phase`` / ``rows_processed``."""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrent)
+
+        job = Job(kind, table)
+        self._jobs[job.id] = job
+        self._forget_old()
+
+        task = asyncio.get_running_loop().create_task(self._run(job, work))
+        self._tasks[job.id] = task
+        task.add_done_callback(lambda _t, job_id=job.id: self._tasks.pop(job_id, None))
+        return job
+
+    async def wait(self, job_id: str) -> Optional[Job]:
+        task = self._tasks.get(job_id)
+        if task is not None:
+            await asyncio.shield(task)
+        return self.get(job_id)
+
+    async def _run(self, job: Job, work) -> None:
+        async with self._semaphore:
+            job.started_at = time.time()
+            try:
+                job.result = await work(job)
+                job.phase  = "done"
+            except Exception as exc:             # noqa: BLE001 – reported via the job
+                job.error = str(exc) or exc.__class__.__name__
+                job.phase = "failed"
+            finally:
+                job.finished_at = time.time()
+
+    def _forget_old(self) -> None:
+        finished = (j for j in list(self._jobs.values()) if j.finished)
+        for job in itertools.islice(finished, max(0, len(self._jobs) - self.keep)):
+            del self._jobs[job.id]
+
+
+job_runner = JobRunner()
@@ -1,13 +1,18 @@
 # app/main.py
 
+import asyncio
 import os
 from dotenv import load_dotenv
 from fastapi import FastAPI, Request, HTTPException
-from fastapi.responses import FileResponse, RedirectResponse
-from fastapi.staticfiles import StaticFiles
+from fastapi.responses import PlainTextResponse, RedirectResponse, Response
 from starlette.middleware.sessions import SessionMiddleware
 
-from app.database import engine, Base
+from app.compression import CompressionMiddleware
+from app.database import DATA_VERSION_POLL, engine, Base, async_session, pool_stats, watch_data_version
+from app.duplicates import create_signature_table
+from app.metrics import METRICS_ENABLED, TimingMiddleware, registry
+from app.static_assets import STATIC_MAX_AGE, static_assets
+from app.suggestions import build_suggestion_index
 from app.routers.search import router as search_router
 from app.routers.admin import router as admin_router
 
@@ -22,18 +27,66 @@ app.add_middleware(
     secret_key=os.getenv("SECRET_KEY", "change-me-to-a-secure-key"),
 )
 
+# gzip/brotli for API responses above COMPRESS_MIN_SIZE
+app.add_middleware(CompressionMiddleware)
+
+# Server-Timing headers + Prometheus histograms (METRICS_ENABLED=false to skip)
+if METRICS_ENABLED:
+    app.add_middleware(TimingMiddleware)
+
+    def pool_gauges():
+        stats = pool_stats(engine)
+        return [
+            "# TYPE portal_db_pool_connections gauge",
+            *(f'portal_db_pool_connections{{state="{state}"}} {stats[state]}'
+              for state in ("checked_out", "idle", "overflow")),
+            "# TYPE portal_db_pool_wait_seconds_total counter",
+            f"portal_db_pool_wait_seconds_total {stats['wait']['total_seconds']}",
+            "# TYPE portal_db_pool_checkouts_total counter",
+            f"portal_db_pool_checkouts_total {stats['wait']['count']}",
+        ]
+
+    registry.add_collector(pool_gauges)
+
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
+# Static files come from memory, precompressed, with ETag + Cache-Control.
+# Pages are revalidated on every load; other assets are cached STATIC_MAX_AGE.
+PAGE_CACHE_CONTROL  = "no-cache"
+ASSET_CACHE_CONTROL = f"public, max-age={STATIC_MAX_AGE}"
+
+
+async def static_response(request: Request, name: str, cache_control: str = PAGE_CACHE_CONTROL) -> Response:
+    # stat (and, on a change, read + compress) off the event loop
+    asset = await asyncio.to_thread(static_assets.get, name)
+    if asset is None:
+        raise HTTPException(status_code=404, detail="Not Found")
+    status, headers, body = asset.respond(
+        request.headers.get("if-none-match"),
+        request.headers.get("accept-encoding"),
+        cache_control,
+        request.headers.get("range"),
+        request.headers.get("if-range"),
+    )
+    return Response(content=body, status_code=status, headers=headers)
+
+
 # Serve static files under /static
-app.mount("/static", StaticFiles(directory="app/static"), name="static")
+@app.api_route("/static/{name:path}", methods=["GET", "HEAD"], include_in_schema=False)
+async def static_file(request: Request, name: str):
+    return await static_response(request, name, ASSET_CACHE_CONTROL)
 
 # Serve index.html at root URL
 @app.get("/", include_in_schema=False)
-async def root():
-    return FileResponse("app/static/index.html")
+async def root(request: Request):
+    return await static_response(request, "index.html")
 
 # Serve admin_login.html at /admin-login
 @app.get("/admin-login", include_in_schema=False)
-async def admin_login():
-    return FileResponse("app/static/admin_login.html")
+async def admin_login(request: Request):
+    return await static_response(request, "admin_login.html")
 
 # ✅ FIXED: Protected admin panel route with session-based authentication
 @app.get("/admin-panel", include_in_schema=False)
@@ -45,12 +98,12 @@ async def admin_panel(request: Request):
         return RedirectResponse(url="/admin-login", status_code=302)
     
     # User is authenticated, serve the admin panel
-    return FileResponse("app/static/admin_panel.html")
+    return await static_response(request, "admin_panel.html", "private, no-cache")
 
 # Optionally, you can keep /admin as well if you want
 @app.get("/admin", include_in_schema=False)
-async def admin_root():
-    return FileResponse("app/static/admin_login.html")
+async def admin_root(request: Request):
+    return await static_response(request, "admin_login.html")
 
 # Include API routers
 app.include_router(search_router, prefix="/api")
@@ -58,6 +111,22 @@ app.include_router(admin_router, prefix="/api")
 
 @app.on_event("startup")
 async def startup():
+    # Notice writes made by other workers, CLI scripts or manual SQL
+    if DATA_VERSION_POLL > 0:
+        app.state.data_version_watch = asyncio.create_task(watch_data_version())
+
+    # Precompress the pages once instead of on the first request
+    static_assets.preload(["index.html", "admin_login.html", "admin_panel.html"])
+
     # Create any missing tables
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        await create_signature_table(conn)
+
+    # Typeahead index (and, with SEARCH_BACKEND=memory, the BM25 search
+    # index) over every year table; both fall back to SQL if this fails
+    try:
+        async with async_session() as db:
+            await build_suggestion_index(db)
+    except Exception as exc:                     # noqa: BLE001 – want wide catch
+        print(f"[startup] suggestion index not built: {exc}")
@@ -0,0 +1,287 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+
+class WaitStats:
+    """
+    Running count / total / max of a duration, e.g. how long requests wait
+    for a pooled connection.  Updated from the pool's greenlet or worker
+    threads, hence the lock.
+    """
+
+    def __init__(self):
+        self._lock   = threading.Lock()
+        self.count   = 0
+        self.total   = 0.0
+        self.max     = 0.0
+        self.errors  = 0
+        self.last: Optional[float] = None
+
+    def record(self, seconds: float, error: bool = False) -> None:
+        with self._lock:
+            self.count += 1
+            self.total += seconds
+            self.max    = max(self.max, seconds)
+            self.last   = seconds
+            if error:
+                self.errors += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "count": self.count,
+                "errors": self.errors,
+                "total_seconds": round(self.total, 6),
+                "avg_seconds": round(self.total / self.count, 6) if self.count else 0.0,
+                "max_seconds": round(self.max, 6),
+                "last_seconds": None if self.last is None else round(self.last, 6),
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self.count, self.total, self.max, self.errors, self.last = 0, 0.0, 0.0, 0, None
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# Prometheus histograms + Server-Timing
+# ────────────────────────────────────────────────────────────────────────────────
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").strip().lower() in ("1", "true", "yes", "on")
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(pairs: Sequence[Tuple[str, str]]) -> str:
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+class Histogram:
+    """Cumulative-bucket histogram rendered in the Prometheus text format."""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        self.name          = name
+        self.documentation = documentation
+        self.labelnames    = tuple(labelnames)
+        self.buckets       = tuple(sorted(buckets))
+        self._lock         = threading.Lock()
+        self._series: Dict[Tuple[str, ...], list] = {}   # labels → [counts…, sum, count]
+
+    def observe(self, seconds: float, **labels: str) -> None:
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    series[i] += 1
+            series[-2] += seconds
+            series[-1] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = sorted((k, list(v)) for k, v in self._series.items())
+        for key, values in series:
+            pairs = list(zip(self.labelnames, key))
+            for bound, count in zip(self.buckets, values):
+                lines.append(f"{self.name}_bucket{_labels(pairs + [('le', repr(bound))])} {count}")
+            lines.append(f"{self.name}_bucket{_labels(pairs + [('le', '+Inf')])} {values[-1]}")
+            lines.append(f"{self.name}_sum{_labels(pairs)} {values[-2]}")
+            lines.append(f"{self.name}_count{_labels(pairs)} {values[-1]}")
+        return lines
+
+
+class Counter:
+    """Monotonic counter rendered in the Prometheus text format."""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name          = name
+        self.documentation = documentation
+        self.labelnames    = tuple(labelnames)
+        self._lock         = threading.Lock()
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: str) -> float:
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        with self._lock:
+            return self._values.get(key, 0)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            values = sorted(self._values.items())
+        for key, value in values:
+            lines.append(f"{self.name}{_labels(list(zip(self.labelnames, key)))} {value}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._histograms: List[Histogram] = []
+        self._counters: List[Counter] = []
+        self._collectors: List[Callable[[], List[str]]] = []
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (), **kwargs) -> Histogram:
+        histogram = Histogram(name, documentation, labelnames, **kwargs)
+        self._histograms.append(histogram)
+        return histogram
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        counter = Counter(name, documentation, labelnames)
+        self._counters.append(counter)
+        return counter
+
+    def add_collector(self, collect: Callable[[], List[str]]) -> None:
+        """``collect()`` returns ready-made exposition lines (e.g. gauges)."""
+        self._collectors.append(collect)
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for histogram in self._histograms:
+            lines += histogram.render()
+        for counter in self._counters:
+            lines += counter.render()
+        for collect in self._collectors:
+            lines += collect()
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+REQUEST_SECONDS = registry.histogram(
+    "portal_request_seconds", "HTTP request latency.", ("route", "method", "status"),
+)
+PHASE_SECONDS = registry.histogram(
+    "portal_phase_seconds", "Time spent in one phase of a request.",
+    ("route", "phase", "table", "search_type"),
+)
+IMPORT_PHASE_SECONDS = registry.histogram(
+    "portal_import_phase_seconds", "Time spent in one phase of an import job.", ("phase",),
+    buckets=(0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0),
+)
+COALESCED_REQUESTS = registry.counter(
+    "portal_singleflight_requests_total",
+    "Response-cache misses that ran the work (leader) or shared one already in flight (coalesced).",
+    ("endpoint", "outcome"),
+)
+
+
+class RequestTiming:
+    """Phases of the current request, for the Server-Timing header."""
+
+    __slots__ = ("scope", "phases")
+
+    def __init__(self, scope: dict):
+        self.scope  = scope
+        self.phases: Dict[str, float] = {}
+
+    @property
+    def route(self) -> str:
+        route = self.scope.get("route")
+        return getattr(route, "path", None) or "unmatched"
+
+    def add(self, phase: str, seconds: float) -> None:
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+    def header(self, total: float) -> str:
+        parts = [f"{phase};dur={seconds * 1000:.2f}" for phase, seconds in self.phases.items()]
+        parts.append(f"total;dur={total * 1000:.2f}")
+        return ", ".join(parts)
+
+
+_current: ContextVar[Optional[RequestTiming]] = ContextVar("request_timing", default=None)
+
+
+@contextmanager
+def timed(phase: str, table: str = "", search_type: str = "") -> Iterator[None]:
+    """
+    Time a hot-path phase of the current request: added to its Server-Timing
+    header and to ``portal_phase_seconds``.  A no-op when metrics are off.
+    """
+    if not METRICS_ENABLED:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        timing  = _current.get()
+        route   = "background"
+        if timing is not None:
+            timing.add(phase, elapsed)
+            route = timing.route
+        PHASE_SECONDS.observe(elapsed, route=route, phase=phase, table=table, search_type=search_type)
+
+
+@contextmanager
+def timed_import(phase: str) -> Iterator[None]:
+    """Time one phase of a background import into ``portal_import_phase_seconds``."""
+    if not METRICS_ENABLED:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        IMPORT_PHASE_SECONDS.observe(time.perf_counter() - start, phase=phase)
+
+
+class TimingMiddleware:
+    """
+    Pure ASGI middleware: adds ``Server-Timing`` to every HTTP response and
+    records ``portal_request_seconds`` per route.  Only installed when
+    METRICS_ENABLED, so it costs nothing otherwise.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timing = RequestTiming(scope)
+        token  = _current.set(timing)
+        start  = time.perf_counter()
+        status = 500
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status  = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", timing.header(time.perf_counter() - start).encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            REQUEST_SECONDS.observe(
+                time.perf_counter() - start,
+                route=timing.route, method=scope.get("method", ""), status=str(status),
+            )
@@ -0,0 +1,87 @@
+"""
+Fold the per-year tables into the partitioned ``projects`` table.
+
+    python -m app.migrate_partitions            # migrate every year table
+    python -m app.migrate_partitions 2023_24    # only the named tables
+    python -m app.migrate_partitions --drop-old # also drop <table>__previous
+
+Each table is copied into a staging partition (usn/name arrays flattened to
+text, search_vector regenerated), indexed, and swapped in under its own name
+exactly like a re-import, so the app keeps serving searches throughout.
+The original table is kept as ``<table>__previous`` unless --drop-old is
+given.  Run with STORAGE_MODE=partitioned afterwards so new imports become
+partitions too.  Running servers see the writes within DATA_VERSION_POLL
+seconds and drop their cached responses and ETags (see
+app.database.watch_data_version).
+"""
+import argparse
+import asyncio
+
+from dotenv import load_dotenv
+load_dotenv()
+
+from sqlalchemy import text
+
+from app.catalog import PREVIOUS_SUFFIX, STAGING_SUFFIX, SchemaCatalog
+from app.database import engine
+from app.importer import (
+    PARTITIONED_TABLE, create_partition_statements, create_search_indexes,
+    ensure_partitioned_parent, swap_in_staging,
+)
+from app.search_sql import REQUIRED_COLUMNS, build_projection
+from app.spreadsheet import TABLE_COLUMNS
+
+
+async def migrate_table(table_name: str, columns: dict, drop_old: bool) -> int:
+    staging = table_name + STAGING_SUFFIX
+    select  = build_projection(columns)
+
+    async with engine.begin() as conn:
+        await conn.execute(text(f'DROP TABLE IF EXISTS "{staging}"'))
+        for stmt in create_partition_statements(staging, table_name):
+            await conn.execute(text(stmt))
+
+        # build_projection yields RESULT_COLUMNS; pick them by name
+        result = await conn.execute(text(f"""
+            INSERT INTO "{staging}" ({", ".join(TABLE_COLUMNS)})
+            SELECT {", ".join(TABLE_COLUMNS)}
+            FROM (SELECT {select} FROM "{table_name}") src
+        """))
+        await create_search_indexes(conn, staging)
+        await swap_in_staging(conn, table_name, PARTITIONED_TABLE)
+
+        if drop_old:
+            await conn.execute(text(f'DROP TABLE IF EXISTS "{table_name + PREVIOUS_SUFFIX}"'))
+    return result.rowcount
+
+
+async def main(tables, drop_old: bool) -> None:
+    async with engine.begin() as conn:
+        await ensure_partitioned_parent(conn)
+
+    catalog = SchemaCatalog()
+    async with engine.connect() as conn:
+        year_tables = await catalog.year_tables(conn)
+        parents     = await catalog.partition_parents(conn)
+        columns     = {t: await catalog.columns(conn, t) for t in year_tables}
+
+    for table_name in tables or year_tables:
+        if table_name not in columns:
+            print(f"[migrate] {table_name}: no such year table")
+        elif table_name in parents:
+            print(f"[migrate] {table_name}: already a partition of {parents[table_name]}")
+        elif not set(REQUIRED_COLUMNS) <= set(columns[table_name]):
+            print(f"[migrate] {table_name}: missing {REQUIRED_COLUMNS}, skipped")
+        else:
+            rows = await migrate_table(table_name, columns[table_name], drop_old)
+            print(f"[migrate] {table_name}: {rows} rows moved into {PARTITIONED_TABLE}")
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("tables", nargs="*", help="year tables to migrate (default: all)")
+    parser.add_argument("--drop-old", action="store_true", help="drop the original tables")
+    args = parser.parse_args()
+    asyncio.run(main(args.tables, args.drop_old))
@@ -0,0 +1,88 @@
+import hashlib
+import random
+import re
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+
+NUM_PERM = 64                    # signature length
+BANDS    = 16                    # LSH bands of NUM_PERM // BANDS rows each
+# → two titles share a band with probability ≈ 1 - (1 - J^4)^16, i.e. almost
+#   always above Jaccard 0.6 and rarely below 0.3
+
+_PRIME = (1 << 61) - 1
+_rng   = random.Random(1729)     # fixed: signatures are persisted
+_PERMUTATIONS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERM)]
+
+WORD_RE = re.compile(r"[a-z0-9]+")
+
+Signature = Tuple[int, ...]
+
+
+def normalize_title(title: Optional[str]) -> str:
+    """Lower-case words only – the key signatures are stored under."""
+    return " ".join(WORD_RE.findall((title or "").lower()))
+
+
+def shingles(normalized: str) -> Set[str]:
+    """Character trigrams of each padded word, as pg_trgm builds them."""
+    grams = set()
+    for word in normalized.split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def _hash(gram: str) -> int:
+    return int.from_bytes(hashlib.blake2b(gram.encode(), digest_size=8).digest(), "big")
+
+
+def signature(normalized: str) -> Optional[Signature]:
+    """MinHash signature of a normalised title; None if it has no words."""
+    hashes = [_hash(g) for g in shingles(normalized)]
+    if not hashes:
+        return None
+    return tuple(min((a * h + b) % _PRIME for h in hashes) for a, b in _PERMUTATIONS)
+
+
+def similarity(a: Sequence[int], b: Sequence[int]) -> float:
+    """Estimated Jaccard similarity of the two trigram sets."""
+    return sum(1 for x, y in zip(a, b) if x == y) / len(a)
+
+
+class LSHIndex:
+    """
+    Banded locality-sensitive hashing over MinHash signatures: only titles
+    that agree on every row of at least one band become candidates, so a
+    lookup touches a handful of entries instead of every stored title.
+    """
+
+    def __init__(self, bands: int = BANDS):
+        self.bands = bands
+        self.rows  = NUM_PERM // bands
+        self._buckets: Dict[Tuple[int, Tuple[int, ...]], List[int]] = {}
+        self._items: List[Tuple[object, Signature]] = []
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def _band_keys(self, sig: Signature) -> Iterable[Tuple[int, Tuple[int, ...]]]:
+        for band in range(self.bands):
+            yield band, sig[band * self.rows:(band + 1) * self.rows]
+
+    def add(self, item, sig: Signature) -> None:
+        position = len(self._items)
+        self._items.append((item, sig))
+        for key in self._band_keys(sig):
+            self._buckets.setdefault(key, []).append(position)
+
+    def query(self, sig: Signature, threshold: float) -> List[Tuple[object, float]]:
+        """Stored items whose estimated similarity is ≥ ``threshold``, best first."""
+        seen: Set[int] = set()
+        for key in self._band_keys(sig):
+            seen.update(self._buckets.get(key, ()))
+        scored = []
+        for position in seen:
+            score = similarity(sig, self._items[position][1])
+            if score >= threshold:
+                scored.append((-score, position))
+        return [(self._items[position][0], -neg) for neg, position in sorted(scored)]
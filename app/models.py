@@ -1,6 +1,7 @@
-from sqlalchemy import Column, Integer, Text, text
+from sqlalchemy import Column, Computed, Integer, Text, text
 from sqlalchemy.dialects.postgresql import ARRAY, TSVECTOR
 from app.database import Base
+from app.indexes import SEARCH_VECTOR_EXPR
 
 class Project(Base):
     __tablename__ = "2024_25"  # Repeat similar classes for other years
@@ -12,4 +13,4 @@ class Project(Base):
     guide_name = Column(Text, nullable=False)
     outcomes = Column(Text)
     proof_link = Column(Text)
-    search_vector = Column(TSVECTOR)
\ No newline at end of file
+    search_vector = Column(TSVECTOR, Computed(SEARCH_VECTOR_EXPR, persisted=True))
\ No newline at end of file
@@ -0,0 +1,79 @@
+import base64
+import json
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+
+# Left out of admin table pages unless requested with ``columns=``
+HIDDEN_COLUMNS = ("search_vector",)
+
+# Admin pages are keyed on group_no.  Ordering by (length, text) sorts the
+# numeric group numbers of TEXT and INTEGER tables alike (2 before 10).
+# The same expressions back idx_<table>_group_no (app/indexes.py).
+GROUP_NO_KEYS  = ("length(group_no::text)", "group_no::text")
+GROUP_NO_ORDER = ", ".join(GROUP_NO_KEYS)
+
+
+# (rank, project_year, group_no) of the last row on the previous page
+SearchKey = Tuple[float, str, str]
+
+
+def encode_cursor(rank: float, project_year: str, group_no: str) -> str:
+    """
+    Opaque keyset cursor for the row *after* which the next page starts.
+    """
+    raw = json.dumps([rank, project_year, group_no], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[SearchKey]:
+    """
+    Inverse of ``encode_cursor``.  Raises ValueError for anything that was not
+    produced by it, so callers can turn that into a 400.
+    """
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        rank, project_year, group_no = json.loads(base64.urlsafe_b64decode(padded))
+    except Exception as exc:                     # noqa: BLE001 – any garbage
+        raise ValueError("Malformed cursor") from exc
+
+    if not isinstance(rank, (int, float)) or isinstance(rank, bool):
+        raise ValueError("Malformed cursor")
+    if not isinstance(project_year, str) or not isinstance(group_no, str):
+        raise ValueError("Malformed cursor")
+    return float(rank), project_year, group_no
+
+
+def select_columns(requested: Optional[str], available: Iterable[str]) -> List[str]:
+    """
+    Projection for an admin table page, in table order.  ``requested`` is a
+    comma-separated list; ``None`` means every column but HIDDEN_COLUMNS.
+    group_no is always included since it is the page key.  Raises ValueError
+    for names the table does not have.
+    """
+    available = list(available)
+    if not requested:
+        wanted = {c for c in available if c not in HIDDEN_COLUMNS}
+    else:
+        wanted  = {c.strip() for c in requested.split(",") if c.strip()}
+        unknown = wanted - set(available)
+        if unknown:
+            raise ValueError(f"Unknown column(s): {', '.join(sorted(unknown))}")
+    wanted.add("group_no")
+    return [c for c in available if c in wanted]
+
+
+def parse_fields(requested: Optional[str], allowed: Sequence[str]) -> Tuple[str, ...]:
+    """
+    ``fields=`` of a search request as a tuple in ``allowed`` order, so equal
+    selections share cache entries and statements.  Empty means every field;
+    raises ValueError for unknown names.
+    """
+    if not requested:
+        return tuple(allowed)
+    wanted  = {f.strip() for f in requested.split(",") if f.strip()}
+    unknown = wanted - set(allowed)
+    if unknown:
+        raise ValueError(f"Unknown field(s): {', '.join(sorted(unknown))}")
+    return tuple(f for f in allowed if f in wanted)
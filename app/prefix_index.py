@@ -0,0 +1,129 @@
+import heapq
+import re
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+FIELDS   = ("project_title", "guide_name")
+
+
+def tokenize(value: str) -> List[str]:
+    return TOKEN_RE.findall(value.lower())
+
+
+class PrefixIndex:
+    """
+    Sorted token array over project titles and guide names.
+
+    Every token of every phrase is stored once as ``(token, entry_id)`` in a
+    sorted list, so all tokens sharing a prefix form one contiguous slice that
+    ``bisect`` finds in O(log n).  Entries remember their (table, row, field)
+    so rows can be replaced or removed as the admin edits them.
+    """
+
+    def __init__(self):
+        self._keys: List[Tuple[str, int]] = []                   # sorted
+        self._entries: Dict[int, Tuple[str, str, str]] = {}      # id → (table, field, text)
+        self._rows: Dict[Tuple[str, str], List[int]] = {}        # (table, group) → ids
+        self._next_id = 0
+        self.ready    = False
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # ── maintenance ─────────────────────────────────────────────────────────────
+    def _add_row(self, table: str, group_no, title: Optional[str], guide: Optional[str]) -> List[Tuple[str, int]]:
+        """Register one row's entries; returns their keys, not yet in ``_keys``."""
+        ids, keys = [], []
+        for field, value in zip(FIELDS, (title, guide)):
+            value = (value or "").strip()
+            if not value:
+                continue
+            entry_id       = self._next_id
+            self._next_id += 1
+            self._entries[entry_id] = (table, field, value)
+            keys += [(token, entry_id) for token in set(tokenize(value))]
+            ids.append(entry_id)
+        if ids:
+            self._rows[(table, str(group_no))] = ids
+        return keys
+
+    def upsert_row(self, table: str, group_no, title: Optional[str], guide: Optional[str]) -> None:
+        self.delete_row(table, group_no)
+        for key in self._add_row(table, group_no, title, guide):
+            insort(self._keys, key)
+
+    def delete_row(self, table: str, group_no) -> None:
+        for entry_id in self._rows.pop((table, str(group_no)), []):
+            _, _, value = self._entries.pop(entry_id)
+            for token in set(tokenize(value)):
+                pos = bisect_left(self._keys, (token, entry_id))
+                if pos < len(self._keys) and self._keys[pos] == (token, entry_id):
+                    del self._keys[pos]
+
+    def drop_table(self, table: str) -> None:
+        # one pass over _keys instead of a list deletion per token
+        dropped = set()
+        for key in [k for k in self._rows if k[0] == table]:
+            dropped.update(self._rows.pop(key))
+        for entry_id in dropped:
+            del self._entries[entry_id]
+        if dropped:
+            self._keys = [key for key in self._keys if key[1] not in dropped]
+
+    def replace_table(self, table: str, rows: Iterable[Tuple[object, str, str]]) -> None:
+        """
+        Swap in a whole table's ``(group_no, title, guide)`` rows: the new keys
+        are sorted once and merged with the rest, O(n log n) for an import.
+        """
+        self.drop_table(table)
+        added = {}
+        for group_no, title, guide in rows:
+            # a repeated group_no replaces the earlier row, as upsert_row would
+            self.delete_row(table, group_no)
+            added[str(group_no)] = self._add_row(table, group_no, title, guide)
+        keys = sorted(key for row_keys in added.values() for key in row_keys)
+        self._keys = list(heapq.merge(self._keys, keys))
+
+    # ── lookup ──────────────────────────────────────────────────────────────────
+    def _prefix_ids(self, prefix: str) -> Set[int]:
+        ids = set()
+        pos = bisect_left(self._keys, (prefix, -1))
+        while pos < len(self._keys) and self._keys[pos][0].startswith(prefix):
+            ids.add(self._keys[pos][1])
+            pos += 1
+        return ids
+
+    def suggest(
+        self,
+        query: str,
+        tables: Optional[Iterable[str]] = None,
+        fields: Iterable[str] = FIELDS,
+        limit: int = 10
+    ) -> List[str]:
+        """
+        Distinct phrases in which every query word is a prefix of some word,
+        e.g. ``"mach lear"`` → ``"Machine Learning Based …"``.
+        """
+        words = tokenize(query)
+        if not words:
+            return []
+
+        # start from the narrowest slice, then check the other words
+        words.sort(key=len, reverse=True)
+        candidates = self._prefix_ids(words[0])
+        for word in words[1:]:
+            candidates &= self._prefix_ids(word)
+            if not candidates:
+                return []
+
+        tables  = set(tables) if tables is not None else None
+        fields  = set(fields)
+        matches = set()
+        for entry_id in candidates:
+            table, field, value = self._entries[entry_id]
+            if field in fields and (tables is None or table in tables):
+                matches.add(value)
+
+        return sorted(matches)[:limit]
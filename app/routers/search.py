@@ -1,9 +1,23 @@
-from fastapi import APIRouter, Depends, Query, HTTPException
+import asyncio
+import time
+
+from fastapi import APIRouter, Depends, Query, HTTPException, Request, Response
 from sqlalchemy import text
+from sqlalchemy.sql.elements import TextClause
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.database import get_db
-from typing import Optional, List
-import re
+from app.cache import data_version, etag_matches, make_etag, normalize_query, response_cache
+from app.catalog import schema_catalog
+from app.database import engine, get_db
+from app.metrics import COALESCED_REQUESTS, timed
+from app.pagination import SearchKey, decode_cursor, encode_cursor, parse_fields
+from app.search_sql import FACET_GUIDES, SEARCH_FIELDS, plan_search, search_page
+from app.serialization import dumps
+from app.singleflight import SingleFlight
+from app.slow_queries import slow_query_log
+from app.statements import StatementRegistry
+from app.bm25 import Hit, facet_counts
+from app.suggestions import SEARCH_BACKEND, search_index, similar_index, suggestion_index
+from typing import Awaitable, Callable, Dict, Optional, List, Sequence, Set, Tuple
 
 
 router = APIRouter()
@@ -12,205 +26,275 @@ router = APIRouter()
 # ────────────────────────────────────────────────────────────────────────────────
 # Helpers
 # ────────────────────────────────────────────────────────────────────────────────
-SAFE_TABLE_RE = re.compile(r"^[A-Za-z0-9_]{1,63}$")      # backend + frontend rule
-BLOCKLIST     = {"alembic_version"}                      # skip system tables
-
-
-
 async def get_year_tables(db: AsyncSession) -> List[str]:
     """
     Return every user-created table whose name is “safe” (letters / digits /
     underscores, ≤63 chars).  The list is converted from underscores to hyphens
     before being sent to the UI so that names read nicely there.
-    """
-    query = text(
-        """
-        SELECT tablename
-        FROM   pg_tables
-        WHERE  schemaname = 'public'
-        """
-    )
-    result = await db.execute(query)
-
-
-    tables = [
-        row[0] for row in result
-        if SAFE_TABLE_RE.match(row[0]) and row[0] not in BLOCKLIST
-    ]
 
+    Served from the in-process schema catalog – no catalog query per request.
+    """
+    tables = await schema_catalog.year_tables(db)
 
     # foo_bar → foo-bar  (purely cosmetic for the frontend)
-    return [t.replace("_", "-") for t in sorted(tables)]
+    return [t.replace("_", "-") for t in tables]
 
 
 
-async def get_table_columns(db: AsyncSession, table_name: str) -> List[str]:
-    query = text(
-        """
-        SELECT column_name
-        FROM   information_schema.columns
-        WHERE  table_name   = :table_name
-          AND  table_schema = 'public'
-        """
-    )
-    result = await db.execute(query, {"table_name": table_name})
-    return [row[0] for row in result]
+async def get_tables_column_types(
+    db: AsyncSession,
+    table_names: List[str]
+) -> Dict[str, Dict[str, str]]:
+    """
+    ``{table: {column: data_type}}`` for many tables, from the schema catalog.
+    """
+    return {t: await schema_catalog.columns(db, t) for t in table_names}
 
 
 
 # ────────────────────────────────────────────────────────────────────────────────
-# Core search logic
+# Limits (the SQL builders live in app.search_sql)
 # ────────────────────────────────────────────────────────────────────────────────
-async def search_projects(
-    year: str,
-    search_term: str,
-    db: AsyncSession,
-    search_type: str = "all"
-):
-    # ── Search across every table ───────────────────────────────────────────────
-    if year == "all":
-        tables  = await get_year_tables(db)
-        results = []
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE     = 200
+MAX_SIMILAR       = 50
 
 
-        for y in tables:
-            table_name = y.replace("-", "_")
-            try:
-                sub = await search_single_table(table_name, search_term, db, search_type)
-                for r in sub:
-                    r = dict(r)
-                    r["project_year"] = y          # keep hyphen format for UI
-                    results.append(r)
-            except Exception as exc:               # noqa: BLE001 – want wide catch
-                print(f"[search] error in {table_name}: {exc}")
-                continue
-
-
-        # sort by year asc  ➜  rank desc
-        results.sort(key=lambda x: (x.get("project_year", ""), -x.get("rank", 0)))
-        return results
 
+# ────────────────────────────────────────────────────────────────────────────────
+# Execution + slow-query capture
+# ────────────────────────────────────────────────────────────────────────────────
+_explain_tasks: Set[asyncio.Task] = set()
 
-    # ── Single-table search ────────────────────────────────────────────────────
-    tables = await get_year_tables(db)
-    if year not in tables:
-        raise HTTPException(status_code=400, detail="Unknown table name.")
 
+async def execute_search_sql(db: AsyncSession, query: TextClause, params: dict, label: str):
+    """
+    ``db.execute`` that records failures and statements slower than
+    SLOW_QUERY_MS in the slow-query log (GET /api/admin/slow-queries).
+    """
+    start = time.perf_counter()
+    try:
+        result = await db.execute(query, params)
+    except Exception as exc:
+        slow_query_log.record(label, query.text, params, time.perf_counter() - start, error=str(exc))
+        raise
+
+    elapsed = time.perf_counter() - start
+    if slow_query_log.is_slow(elapsed):
+        entry = slow_query_log.record(label, query.text, params, elapsed)
+        if entry["plan_status"] == "pending":
+            if _explain_tasks:                   # one EXPLAIN ANALYZE at a time
+                entry["plan_status"] = "skipped"
+            else:
+                task = asyncio.get_running_loop().create_task(capture_plan(entry, query, params))
+                _explain_tasks.add(task)
+                task.add_done_callback(_explain_tasks.discard)
+    return result
+
+
+async def capture_plan(entry: dict, query: TextClause, params: dict) -> None:
+    """
+    Attach ``EXPLAIN (ANALYZE, BUFFERS)`` of a slow statement to its log
+    entry.  Runs after the response on its own connection; the statement is
+    re-executed, inside a transaction that is rolled back.
+    """
+    try:
+        async with engine.connect() as conn:
+            result = await conn.execute(text(f"EXPLAIN (ANALYZE, BUFFERS) {query.text}"), params)
+            entry["plan"] = "\n".join(row[0] for row in result)
+            entry["plan_status"] = "captured"
+            await conn.rollback()
+    except Exception as exc:                     # noqa: BLE001 – reported in the entry
+        entry["plan"] = str(exc)
+        entry["plan_status"] = "failed"
 
-    table_name = year.replace("-", "_")
-    sub = await search_single_table(table_name, search_term, db, search_type)
 
 
-    results = []
-    for r in sub:
-        r = dict(r)
-        r["project_year"] = year
-        results.append(r)
+# ────────────────────────────────────────────────────────────────────────────────
+# Core search logic
+# ────────────────────────────────────────────────────────────────────────────────
+# Built search/suggestion statements, reused until the schema catalog reloads
+search_statements = StatementRegistry()
 
+CompiledSearch = Tuple[Optional[TextClause], Dict[str, List[str]]]
 
-    return results
 
+async def compile_search(
+    db: AsyncSession,
+    table_names: List[str],
+    search_type: str,
+    keyset: bool,
+    fields: Sequence[str] = SEARCH_FIELDS,
+    facets: bool = False
+) -> CompiledSearch:
+    """
+    Build the UNION ALL statement for ``table_names`` once per catalog
+    version.  Returns ``(query, partition_params)`` – the query is None when
+    no table is searchable; partition_params maps each ``partition_years_i``
+    bind to the partitions searched through that parent.
+    """
+    with timed("columns"):
+        parents = await schema_catalog.partition_parents(db)
+        needed  = [t for t in table_names if t not in parents]
+        needed += sorted({parents[t] for t in table_names if t in parents})
+        columns = await get_tables_column_types(db, needed)
+    sql, params = plan_search(table_names, columns, parents, search_type, keyset, fields, facets)
+    return (text(sql) if sql is not None else None), params
 
 
-async def search_single_table(
-    table_name: str,
+async def search_projects(
+    year: str,
     search_term: str,
     db: AsyncSession,
-    search_type: str = "all"
+    search_type: str = "all",
+    limit: int = DEFAULT_PAGE_SIZE,
+    after: Optional[SearchKey] = None,
+    fields: Sequence[str] = SEARCH_FIELDS,
+    facets: bool = False
 ):
-    # figure out which optional columns exist
-    columns           = await get_table_columns(db, table_name)
-    has_search_vector = "search_vector"  in columns
-    has_ppt_links     = "ppt_links"      in columns
-    has_report_links  = "report_links"   in columns
-
-
-    ppt_links_col    = "COALESCE(ppt_links, '')  AS ppt_links"   if has_ppt_links   else "'' AS ppt_links"
-    report_links_col = "COALESCE(report_links, '') AS report_links" if has_report_links else "'' AS report_links"
-
+    """
+    One page of ranked hits for a single year or – with ``year == "all"`` –
+    every year table in a single UNION ALL statement.  Years stored as
+    partitions are searched through their parent in one branch.  Each hit
+    carries only ``fields`` (in SEARCH_FIELDS order).
+
+    Returns ``{"results", "total", "next_cursor"}`` – plus ``"facets"``
+    (hits per year, top guides) when asked; pass the decoded ``next_cursor``
+    back as ``after`` to fetch the following page.
+    """
+    with timed("year_tables"):
+        tables = await get_year_tables(db)
 
-    # build search condition ----------------------------------------------------
-    if search_type == "title":
-        search_condition = (
-            "to_tsvector('english', COALESCE(project_title, '')) "
-            "@@ plainto_tsquery('english', :search_term)"
-        )
-        rank_expression  = (
-            "ts_rank(to_tsvector('english', COALESCE(project_title, '')), "
-            "plainto_tsquery('english', :search_term))"
-        )
-    elif search_type == "guide":
-        search_condition = (
-            "to_tsvector('english', COALESCE(guide_name, '')) "
-            "@@ plainto_tsquery('english', :search_term)"
-        )
-        rank_expression  = (
-            "ts_rank(to_tsvector('english', COALESCE(guide_name, '')), "
-            "plainto_tsquery('english', :search_term))"
-        )
+    if year == "all":
+        table_names = [y.replace("-", "_") for y in tables]
+    elif year in tables:
+        table_names = [year.replace("-", "_")]
     else:
-        if has_search_vector:
-            search_condition = "search_vector @@ plainto_tsquery('english', :search_term)"
-            rank_expression  = "ts_rank(search_vector, plainto_tsquery('english', :search_term))"
-        else:
-            weighted_vector = """
-                setweight(to_tsvector('english', COALESCE(project_title, '')), 'A') ||
-                setweight(to_tsvector('english', COALESCE(guide_name,  '')), 'B')
-            """
-            search_condition = f"({weighted_vector}) @@ plainto_tsquery('english', :search_term)"
-            rank_expression  = f"ts_rank(({weighted_vector}), plainto_tsquery('english', :search_term))"
-
-
-    query = text(f"""
-        SELECT
-            group_no,
-            usn,
-            name,
-            project_title,
-            guide_name,
-            outcomes,
-            proof_link,
-            {ppt_links_col},
-            {report_links_col},
-            {rank_expression} AS rank
-        FROM "{table_name}"
-        WHERE {search_condition}
-        ORDER BY rank DESC, project_title ASC
-    """)
+        raise HTTPException(status_code=400, detail="Unknown table name.")
 
+    if SEARCH_BACKEND == "memory" and search_index.ready and search_type != "fuzzy":
+        with timed("memory_index", table=year, search_type=search_type):
+            ranked = search_index.search(search_term, table_names, search_type)
+        return memory_page(ranked, limit, after, fields, facets)
+
+    key      = ("search", tuple(table_names), search_type, after is not None, tuple(fields), facets)
+    compiled = search_statements.get(key, schema_catalog.version)
+    if compiled is None:
+        with timed("compile", table=year, search_type=search_type):
+            compiled = await compile_search(db, table_names, search_type, after is not None, fields, facets)
+        search_statements.put(key, schema_catalog.version, compiled)
+    query, partition_params = compiled
+
+    empty = {"results": [], "total": 0, "next_cursor": None}
+    if facets:
+        empty["facets"] = {"years": [], "guides": []}
+    if query is None:
+        return empty
+
+    # fetch one extra row to learn whether another page exists
+    params = {"search_term": search_term, "limit": limit + 1, **partition_params}
+    if after is not None:
+        params.update(after_rank=after[0], after_year=after[1], after_group=after[2])
 
     try:
-        result = await db.execute(query, {"search_term": search_term})
-        return result.mappings().all()
+        with timed("query", table=year, search_type=search_type):
+            result = await execute_search_sql(db, query, params, f"search/{search_type}/{year}")
+            rows   = result.all()
     except Exception as exc:                     # noqa: BLE001 – want wide catch
-        print(f"[search] query error in {table_name}: {exc}")
-        return []
+        # pool timeout, lock_timeout during an import swap, missing pg_trgm …
+        # – an error, not "no results", so it must not reach the cache
+        print(f"[search] query error for year={year}: {exc}")
+        raise HTTPException(status_code=503, detail="Search is temporarily unavailable.")
+
+    return search_page(rows, limit, fields, facets)
+
+
+def memory_page(
+    ranked: List[Hit],
+    limit: int,
+    after: Optional[SearchKey],
+    fields: Sequence[str],
+    facets: bool
+) -> dict:
+    """
+    The ``search_projects`` response for hits of the in-memory index, cut
+    with the same keyset as the SQL path.
+    """
+    page = ranked
+    if after is not None:
+        after_key = (-after[0], after[1], after[2])
+        page = [h for h in ranked if (-h[0], h[1].project_year, h[1].group_no) > after_key]
+
+    next_cursor = None
+    if len(page) > limit:
+        page = page[:limit]
+        rank, doc = page[-1]
+        next_cursor = encode_cursor(rank, doc.project_year, doc.group_no)
+
+    def hit(rank, doc):
+        extra = {"project_year": doc.project_year, "rank": rank}
+        return {f: extra[f] if f in extra else doc.get(f) for f in fields}
+
+    response = {
+        "results": [hit(rank, doc) for rank, doc in page],
+        "total": len(ranked),
+        "next_cursor": next_cursor,
+    }
+    if facets:
+        response["facets"] = facet_counts([doc for _, doc in ranked], FACET_GUIDES)
+    return response
 
 
 
 # ────────────────────────────────────────────────────────────────────────────────
 # Autocomplete helpers
 # ────────────────────────────────────────────────────────────────────────────────
+SUGGESTION_FIELDS = {
+    "all":   ("project_title", "guide_name"),
+    "title": ("project_title",),
+    "guide": ("guide_name",),
+}
+
+
 async def get_suggestions(
     year: str,
     search_term: str,
     db: AsyncSession,
     search_type: str = "all"
 ):
+    # ── In-memory prefix index (built at startup, kept current by admin) ──────
+    if suggestion_index.ready:
+        tables = await get_year_tables(db)
+        if year == "all":
+            wanted = [y.replace("-", "_") for y in tables]
+        elif year in tables:
+            wanted = [year.replace("-", "_")]
+        else:
+            raise HTTPException(status_code=400, detail="Unknown table name.")
+
+        fields = SUGGESTION_FIELDS.get(search_type, SUGGESTION_FIELDS["all"])
+        with timed("prefix_index", table=year, search_type=search_type):
+            return suggestion_index.suggest(search_term, wanted, fields, limit=10)
+
+    # ── Fallback: query Postgres table by table ────────────────────────────────
     if year == "all":
         tables          = await get_year_tables(db)
         all_suggestions = set()
 
 
+        failed          = False
         for y in tables:
             try:
                 sub = await get_table_suggestions(y.replace("-", "_"), search_term, db, search_type)
                 all_suggestions.update(sub)
             except Exception as exc:
                 print(f"[suggest] error in {y}: {exc}")
+                failed = True
                 continue
 
-
+        # partial suggestions would be cached as if complete
+        if failed:
+            raise HTTPException(status_code=503, detail="Suggestions are temporarily unavailable.")
         return sorted(all_suggestions)[:10]
 
 
@@ -223,12 +307,7 @@ async def get_suggestions(
 
 
 
-async def get_table_suggestions(
-    table_name: str,
-    search_term: str,
-    db: AsyncSession,
-    search_type: str = "all"
-):
+def build_suggestion_query(table_name: str, search_type: str = "all") -> str:
     # decide which column(s) to sample for suggestions -------------------------
     if search_type == "title":
         column = "project_title"
@@ -236,7 +315,7 @@ async def get_table_suggestions(
         column = "guide_name"
     else:
         # title + guide combined
-        query = text(f"""
+        return f"""
             (SELECT DISTINCT project_title AS suggestion
              FROM   "{table_name}"
              WHERE  to_tsvector('english', COALESCE(project_title, ''))
@@ -252,13 +331,10 @@ async def get_table_suggestions(
              LIMIT 5)
             ORDER BY suggestion
             LIMIT 10
-        """)
-        result = await db.execute(query, {"search_term": search_term})
-        return [row[0] for row in result if row[0]]
-
+        """
 
     # single column suggestion query ------------------------------------------
-    query = text(f"""
+    return f"""
         SELECT DISTINCT {column}
         FROM   "{table_name}"
         WHERE  to_tsvector('english', COALESCE({column}, ''))
@@ -266,9 +342,69 @@ async def get_table_suggestions(
           AND  {column} <> ''
         ORDER BY {column}
         LIMIT 5
-    """)
-    result = await db.execute(query, {"search_term": search_term})
-    return [row[0] for row in result if row[0]]
+    """
+
+
+async def get_table_suggestions(
+    table_name: str,
+    search_term: str,
+    db: AsyncSession,
+    search_type: str = "all"
+):
+    key   = ("suggest", table_name, search_type)
+    query = search_statements.get(key, schema_catalog.version)
+    if query is None:
+        query = text(build_suggestion_query(table_name, search_type))
+        search_statements.put(key, schema_catalog.version, query)
+
+    with timed("query", table=table_name, search_type=search_type):
+        result = await execute_search_sql(
+            db, query, {"search_term": search_term}, f"suggest/{search_type}/{table_name}"
+        )
+        return [row[0] for row in result if row[0]]
+
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# Response cache + conditional requests
+# ────────────────────────────────────────────────────────────────────────────────
+# Identical requests missing the cache at the same time share one computation
+in_flight = SingleFlight(COALESCED_REQUESTS)
+
+
+async def cached_response(
+    request: Request,
+    key: tuple,
+    compute: Callable[[], Awaitable[dict]]
+):
+    """
+    Serve ``compute()`` through the LRU/TTL response cache; only successful
+    results are cached (errors are raised as HTTPException).  The ETag depends
+    only on the data version and the normalised request, so a matching
+    If-None-Match is answered with 304 before any database work.  Concurrent
+    misses for the same key are coalesced: one request computes, the others
+    await its encoded body.
+    """
+    version = data_version.value
+    etag    = make_etag(version, *key)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    # cached as encoded JSON, so a hit skips serialisation entirely
+    body = response_cache.get((version,) + key)
+    if body is None:
+        async def compute_body() -> bytes:
+            payload = await compute()
+            with timed("serialize"):
+                encoded = dumps(payload)
+            response_cache.set((version,) + key, encoded)
+            return encoded
+
+        body = await in_flight.run((version,) + key, compute_body, endpoint=key[0])
+
+    return Response(content=body, media_type="application/json", headers=headers)
 
 
 
@@ -276,34 +412,115 @@ async def get_table_suggestions(
 # Routes
 # ────────────────────────────────────────────────────────────────────────────────
 @router.get("/years")
-async def get_years(db: AsyncSession = Depends(get_db)):
+async def get_years(
+    request: Request,
+    db: AsyncSession = Depends(get_db)
+):
     """
     Return every available data table name (with hyphens instead of underscores
     for readability).
     """
-    years = await get_year_tables(db)
-    return {"years": years}
+    async def compute():
+        return {"years": await get_year_tables(db)}
+
+    return await cached_response(request, ("years",), compute)
 
 
 
 @router.get("/search/")
 async def full_text_search(
+    request: Request,
     year: str = Query(..., description="Table name shown in the dropdown or 'all'"),
     q:   str = Query(..., min_length=2),
-    search_type: Optional[str] = Query("all", regex="^(all|title|guide)$"),
+    search_type: Optional[str] = Query("all", regex="^(all|title|guide|fuzzy)$"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    fields: Optional[str] = Query(
+        None, description="comma-separated result fields, e.g. group_no,project_title,guide_name,project_year"
+    ),
+    facets: bool = Query(False, description="also return hits per year and top guides"),
     db:  AsyncSession = Depends(get_db)
 ):
-    results = await search_projects(year, q, db, search_type)
-    return {"results": results}
+    try:
+        after = decode_cursor(cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor.")
+    try:
+        selected = parse_fields(fields, SEARCH_FIELDS)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+    term = normalize_query(q)
+    key  = ("search", year, term, search_type, limit, cursor, selected, facets)
+
+    async def compute():
+        return await search_projects(year, term, db, search_type, limit, after, selected, facets)
+
+    return await cached_response(request, key, compute)
+
+
+
+@router.get("/projects/similar")
+async def similar_to_text(
+    request: Request,
+    q: str = Query(..., min_length=2, description="proposed title / outcome text"),
+    limit: int = Query(10, ge=1, le=MAX_SIMILAR)
+):
+    """Projects of every year most similar to free text, by TF-IDF cosine."""
+    if not similar_index.ready:
+        raise HTTPException(status_code=503, detail="Similarity index is not loaded.")
+    term = normalize_query(q)
+
+    async def compute():
+        with timed("similarity"):
+            return {"results": similar_index.similar_text(term, limit)}
+
+    # the matrix is rebuilt after data_version moves on: key on its own version
+    key = ("similar_text", similar_index.built_version, term, limit)
+    return await cached_response(request, key, compute)
+
+
+
+@router.get("/projects/{year}/{group_no}/similar")
+async def similar_projects(
+    request: Request,
+    year: str,
+    group_no: str,
+    limit: int = Query(10, ge=1, le=MAX_SIMILAR),
+    db:  AsyncSession = Depends(get_db)
+):
+    """Projects of every year most similar to one project (itself excluded)."""
+    if not similar_index.ready:
+        raise HTTPException(status_code=503, detail="Similarity index is not loaded.")
+    # checked before timing/caching: arbitrary paths must not become metric
+    # labels or cache keys
+    if year not in await get_year_tables(db):
+        raise HTTPException(status_code=404, detail="Unknown year.")
+
+    async def compute():
+        with timed("similarity", table=year):
+            results = similar_index.similar_to(year.replace("-", "_"), group_no, limit)
+        if results is None:
+            raise HTTPException(status_code=404, detail="Unknown project.")
+        return {"results": results}
+
+    key = ("similar", similar_index.built_version, year, group_no, limit)
+    return await cached_response(request, key, compute)
 
 
 
 @router.get("/suggestions/")
 async def get_search_suggestions(
+    request: Request,
     year: str = Query(..., description="Table name shown in the dropdown or 'all'"),
     q:   str = Query(..., min_length=2),
-    search_type: Optional[str] = Query("all", regex="^(all|title|guide)$"),
+    search_type: Optional[str] = Query("all", regex="^(all|title|guide|fuzzy)$"),
     db:  AsyncSession = Depends(get_db)
 ):
-    suggestions = await get_suggestions(year, q, db, search_type)
-    return {"suggestions": suggestions}
\ No newline at end of file
+    term = normalize_query(q)
+    key  = ("suggestions", year, term, search_type)
+
+    async def compute():
+        return {"suggestions": await get_suggestions(year, term, db, search_type)}
+
+    return await cached_response(request, key, compute)
@@ -1,13 +1,14 @@
-from pydantic import BaseModel
+from typing import List, Optional
+
+from pydantic import BaseModel, ConfigDict
 
 class ProjectBase(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     group_no: int
     project_title: str
     guide_name: str
-    usn: list[str]
-    name: list[str]
-    outcomes: str | None = None
-    proof_link: str | None = None
-
-    class Config:
-        orm_mode = True
\ No newline at end of file
+    usn: List[str]
+    name: List[str]
+    outcomes: Optional[str] = None
+    proof_link: Optional[str] = None
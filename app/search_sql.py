@@ -0,0 +1,261 @@
+import json
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+from app.indexes import GUIDE_TSVECTOR_EXPR, SEARCH_VECTOR_EXPR, TITLE_TSVECTOR_EXPR
+from app.pagination import encode_cursor
+
+
+REQUIRED_COLUMNS = ("group_no", "project_title", "guide_name")
+RESULT_COLUMNS   = (
+    "group_no", "usn", "name", "project_title", "guide_name",
+    "outcomes", "proof_link", "ppt_links", "report_links",
+)
+OPTIONAL_COLUMNS = {"ppt_links", "report_links"}          # '' when missing
+
+# What ``fields=`` may ask for; the page key columns are always selected
+SEARCH_FIELDS = RESULT_COLUMNS + ("project_year", "rank")
+KEY_COLUMNS   = ("rank", "project_year", "group_no")
+
+
+def build_projection(columns: Dict[str, str], fields: Sequence[str] = RESULT_COLUMNS) -> str:
+    """
+    Select list shared by every year table.  Tables created by the model use
+    ARRAY columns for usn/name while uploaded ones store plain text, so every
+    column is normalised to text – that is what lets UNION ALL line up.
+    Only the RESULT_COLUMNS named in ``fields`` are selected.
+    """
+    exprs = []
+    for col in RESULT_COLUMNS:
+        if col not in fields:
+            continue
+        data_type = columns.get(col)
+        if data_type is None:
+            expr = "''::text" if col in OPTIONAL_COLUMNS else "NULL::text"
+        elif data_type == "ARRAY":
+            expr = f"array_to_string({col}, ', ')"
+        elif col in OPTIONAL_COLUMNS:
+            expr = f"COALESCE({col}::text, '')"
+        else:
+            expr = f"{col}::text"
+        exprs.append(f"{expr} AS {col}")
+    return ",\n            ".join(exprs)
+
+
+def build_search_condition(columns: Dict[str, str], search_type: str = "all"):
+    """
+    Return ``(where_clause, rank_expression)`` for one table and search mode.
+    """
+    if search_type == "title":
+        # same expression as the idx_<table>_title_fts GIN index
+        search_condition = f"{TITLE_TSVECTOR_EXPR} @@ plainto_tsquery('english', :search_term)"
+        rank_expression  = f"ts_rank({TITLE_TSVECTOR_EXPR}, plainto_tsquery('english', :search_term))"
+    elif search_type == "guide":
+        # same expression as the idx_<table>_guide_fts GIN index
+        search_condition = f"{GUIDE_TSVECTOR_EXPR} @@ plainto_tsquery('english', :search_term)"
+        rank_expression  = f"ts_rank({GUIDE_TSVECTOR_EXPR}, plainto_tsquery('english', :search_term))"
+    elif search_type == "fuzzy":
+        # word similarity: "<%" is served by the gin_trgm_ops indexes, the
+        # cut-off is pg_trgm.word_similarity_threshold (FUZZY_THRESHOLD)
+        search_condition = "(:search_term <% project_title OR :search_term <% guide_name)"
+        rank_expression  = (
+            "GREATEST(word_similarity(:search_term, COALESCE(project_title, '')), "
+            "word_similarity(:search_term, COALESCE(guide_name, '')))"
+        )
+    else:
+        if "search_vector" in columns:
+            search_condition = "search_vector @@ plainto_tsquery('english', :search_term)"
+            rank_expression  = "ts_rank(search_vector, plainto_tsquery('english', :search_term))"
+        else:
+            search_condition = f"({SEARCH_VECTOR_EXPR}) @@ plainto_tsquery('english', :search_term)"
+            rank_expression  = f"ts_rank(({SEARCH_VECTOR_EXPR}), plainto_tsquery('english', :search_term))"
+
+    return search_condition, rank_expression
+
+
+def build_search_branch(
+    table_name: str,
+    columns: Dict[str, str],
+    search_type: str = "all",
+    years_param: Optional[str] = None,
+    fields: Sequence[str] = SEARCH_FIELDS
+) -> Optional[str]:
+    """
+    SELECT for a single year table, tagged with its ``project_year``.  Returns
+    None for tables that cannot be searched (missing core columns) so one odd
+    table does not break a cross-year query.
+
+    With ``years_param`` the table is a partitioned parent: rows carry their
+    own project_year and ``project_year = ANY(:<years_param>)`` prunes the
+    scan to the requested partitions.
+    """
+    missing = [c for c in REQUIRED_COLUMNS if c not in columns]
+    if missing:
+        print(f"[search] skipping {table_name}: missing columns {missing}")
+        return None
+
+    search_condition, rank_expression = build_search_condition(columns, search_type)
+
+    # keep hyphen format for UI
+    if years_param:
+        project_year     = "replace(project_year, '_', '-')"
+        search_condition = f"{search_condition} AND project_year = ANY(:{years_param})"
+    else:
+        project_year = "'%s'::text" % table_name.replace("_", "-")
+
+    return f"""
+        SELECT
+            {build_projection(columns, set(fields) | {"group_no"})},
+            {project_year} AS project_year,
+            {rank_expression} AS rank
+        FROM "{table_name}"
+        WHERE {search_condition}
+    """
+
+
+FACET_GUIDES = 10                # guides listed in the guide facet
+
+# Facet counts over the ``hits`` CTE, selected next to count(*)
+FACET_SELECT = f"""
+            , (SELECT json_agg(json_build_object('value', project_year, 'count', n)
+                               ORDER BY project_year)::text
+               FROM  (SELECT project_year, count(*) AS n FROM hits GROUP BY project_year) y
+              ) AS year_facets
+            , (SELECT json_agg(json_build_object('value', guide_name, 'count', n)
+                               ORDER BY n DESC, guide_name)::text
+               FROM  (SELECT guide_name, count(*) AS n FROM hits
+                      WHERE  guide_name <> ''
+                      GROUP  BY guide_name
+                      ORDER  BY n DESC, guide_name
+                      LIMIT  {FACET_GUIDES}) g
+              ) AS guide_facets
+"""
+
+
+def page_columns(fields: Sequence[str]) -> Tuple[str, ...]:
+    return KEY_COLUMNS + tuple(f for f in fields if f not in KEY_COLUMNS)
+
+
+def build_search_query(
+    branches: List[str],
+    keyset: bool = False,
+    fields: Sequence[str] = SEARCH_FIELDS,
+    facets: bool = False
+) -> str:
+    """
+    Rank every branch in Postgres and cut the page there.  The total hit count
+    comes from the same CTE; the LEFT JOIN keeps that row even when the page
+    itself is empty.  Keyset order is (rank desc, project_year, group_no).
+
+    With ``facets`` the same CTE also yields hits per project_year and the
+    top FACET_GUIDES guides, as JSON text – no second search.
+
+    Columns come back as ``total, *KEY_COLUMNS, *other fields[, year_facets,
+    guide_facets]`` – see ``search_projects`` for how rows become results.
+    """
+    after = ""
+    if keyset:
+        after = """
+            WHERE rank < CAST(:after_rank AS real)
+               OR (rank = CAST(:after_rank AS real)
+                   AND (project_year, group_no) > (:after_year, :after_group))
+        """
+
+    return f"""
+        WITH hits AS (
+            {" UNION ALL ".join(f"({b})" for b in branches)}
+        )
+        SELECT total.hits AS total, {", ".join(f"page.{c}" for c in page_columns(fields))}
+               {", total.year_facets, total.guide_facets" if facets else ""}
+        FROM   (SELECT count(*) AS hits {FACET_SELECT if facets else ""} FROM hits) total
+        LEFT JOIN LATERAL (
+            SELECT *
+            FROM   hits
+            {after}
+            ORDER BY rank DESC, project_year ASC, group_no ASC
+            LIMIT :limit
+        ) page ON TRUE
+        ORDER BY page.rank DESC, page.project_year ASC, page.group_no ASC
+    """
+
+
+def plan_search(
+    table_names: Sequence[str],
+    columns: Mapping[str, Dict[str, str]],
+    parents: Mapping[str, str],
+    search_type: str = "all",
+    keyset: bool = False,
+    fields: Sequence[str] = SEARCH_FIELDS,
+    facets: bool = False
+) -> Tuple[Optional[str], Dict[str, List[str]]]:
+    """
+    The single UNION ALL statement for ``table_names``: one branch per plain
+    year table, one per partitioned parent for all of its requested years.
+    ``columns`` holds the catalog columns of every table and parent,
+    ``parents`` maps partitions to their parent.
+
+    Returns ``(sql, partition_params)`` – sql is None when no table is
+    searchable; partition_params maps each ``partition_years_i`` bind to the
+    partitions searched through that parent.
+    """
+    # the guide facet groups on guide_name, so every branch must project it
+    branch_fields = tuple(fields) + (("guide_name",) if facets else ())
+    partitions: Dict[str, List[str]] = {}
+    params: Dict[str, List[str]] = {}
+    branches = []
+    for t in table_names:
+        if t in parents:
+            partitions.setdefault(parents[t], []).append(t)
+            continue
+        branch = build_search_branch(t, columns.get(t, {}), search_type, fields=branch_fields)
+        if branch:
+            branches.append(branch)
+
+    for i, (parent, years) in enumerate(sorted(partitions.items())):
+        years_param = f"partition_years_{i}"
+        branch      = build_search_branch(parent, columns.get(parent, {}), search_type, years_param, branch_fields)
+        if branch:
+            branches.append(branch)
+            params[years_param] = years
+
+    if not branches:
+        return None, {}
+    return build_search_query(branches, keyset, fields, facets), params
+
+
+def search_page(
+    rows: Sequence[Sequence],
+    limit: int,
+    fields: Sequence[str] = SEARCH_FIELDS,
+    facets: bool = False
+) -> dict:
+    """
+    ``{"results", "total", "next_cursor"[, "facets"]}`` from the rows of
+    build_search_query, fetched with ``:limit`` one above ``limit``: plain
+    tuples of ``(total, rank, project_year, group_no, *other fields[,
+    year_facets, guide_facets])``.
+    """
+    total = rows[0][0] if rows else 0
+    counts = None
+    if facets:
+        year_facets, guide_facets = rows[0][-2:] if rows else (None, None)
+        counts = {
+            "years":  json.loads(year_facets) if year_facets else [],
+            "guides": json.loads(guide_facets) if guide_facets else [],
+        }
+    if rows and rows[0][2] is None:               # LEFT JOIN row of an empty page
+        rows = []
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        _, rank, project_year, group_no = rows[-1][:4]
+        next_cursor = encode_cursor(rank, project_year, group_no)
+
+    position = {c: i + 1 for i, c in enumerate(page_columns(fields))}
+    picks    = [(f, position[f]) for f in fields]
+    hits     = [{f: row[i] for f, i in picks} for row in rows]
+
+    response = {"results": hits, "total": total, "next_cursor": next_cursor}
+    if counts is not None:
+        response["facets"] = counts
+    return response
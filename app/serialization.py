@@ -0,0 +1,14 @@
+import json
+from typing import Any
+
+try:                                             # optional C encoder, ~5-10× faster
+    import orjson
+except ImportError:                              # pragma: no cover – stdlib fallback
+    orjson = None
+
+
+def dumps(obj: Any) -> bytes:
+    """Compact UTF-8 JSON for API responses."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode()
@@ -0,0 +1,195 @@
+import math
+from collections import Counter
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+from app.bm25 import as_text, tokenize
+
+try:                                             # optional, vectorised scoring
+    import numpy as np
+    from scipy import sparse
+except ImportError:                              # pragma: no cover – pure-Python fallback
+    np = sparse = None
+
+
+# Text that makes two projects "similar"
+SIMILARITY_FIELDS = ("project_title", "outcomes")
+
+Key = Tuple[str, str]                            # (table, group_no)
+
+
+class _Entry:
+    __slots__ = ("counts", "title", "guide")
+
+    def __init__(self, counts: Counter, title: Optional[str], guide: Optional[str]):
+        self.counts = counts
+        self.title  = title
+        self.guide  = guide
+
+
+class SimilarityIndex:
+    """
+    TF-IDF vectors (sublinear tf, smoothed idf, L2-normalised) over the title
+    and outcomes of every project, for "similar projects" lookups across all
+    years.
+
+    Rows are re-tokenised one at a time as the admin edits them.  The sparse
+    document × term matrix is not touched by edits: lookups keep using the
+    last one assembled until rebuild() – or snapshot() / assemble() /
+    install(), with assemble() in a worker thread – replaces it.  With
+    NumPy/SciPy a lookup is one sparse mat-vec product, without them the same
+    scores are summed from per-term postings.
+    """
+
+    def __init__(self):
+        self._entries: Dict[Key, _Entry] = {}
+        self._df: Counter = Counter()
+        self._matrix  = None                     # see assemble()
+        self._version = 0                        # bumped by every edit
+        self._built   = -1                       # version the matrix reflects
+        self.ready    = False
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def built_version(self) -> int:
+        """Edit count the served matrix reflects – part of the /similar cache keys."""
+        return self._built
+
+    @property
+    def stale(self) -> bool:
+        """True while edits are not yet reflected in the matrix."""
+        return self._built != self._version
+
+    # ── maintenance ─────────────────────────────────────────────────────────────
+    def upsert_row(self, table: str, record: Mapping[str, object]) -> None:
+        group_no = as_text("group_no", record.get("group_no")) or ""
+        self.delete_row(table, group_no)
+        tokens = []
+        for field in SIMILARITY_FIELDS:
+            tokens += tokenize(as_text(field, record.get(field)))
+        counts = Counter(tokens)
+        self._entries[(table, group_no)] = _Entry(
+            counts,
+            as_text("project_title", record.get("project_title")),
+            as_text("guide_name", record.get("guide_name")),
+        )
+        self._df.update(counts.keys())
+        self._version += 1
+
+    def delete_row(self, table: str, group_no) -> None:
+        entry = self._entries.pop((table, str(group_no)), None)
+        if entry is None:
+            return
+        self._df.subtract(entry.counts.keys())
+        for term in entry.counts:
+            if self._df[term] <= 0:
+                del self._df[term]
+        self._version += 1
+
+    def drop_table(self, table: str) -> None:
+        for key in [k for k in self._entries if k[0] == table]:
+            self.delete_row(*key)
+
+    def replace_table(self, table: str, records: Iterable[Mapping[str, object]]) -> None:
+        self.drop_table(table)
+        for record in records:
+            self.upsert_row(table, record)
+
+    # ── vectors ─────────────────────────────────────────────────────────────────
+    def snapshot(self) -> Tuple[Dict[Key, _Entry], Dict[str, int], int]:
+        """Copies of the current rows for assemble(); entries are never mutated in place."""
+        return dict(self._entries), dict(self._df), self._version
+
+    def install(self, matrix, version: int) -> None:
+        self._matrix = matrix
+        self._built  = version
+
+    def rebuild(self) -> None:
+        entries, df, version = self.snapshot()
+        self.install(self.assemble(entries, df), version)
+
+    @classmethod
+    def assemble(cls, entries: Dict[Key, _Entry], df: Dict[str, int]):
+        """The matrix for a snapshot() – touches no shared state, safe off the event loop."""
+        keys  = list(entries)
+        vocab = {term: i for i, term in enumerate(df)}
+        n     = len(keys)
+        idf   = {term: math.log((1 + n) / (1 + count)) + 1 for term, count in df.items()}
+
+        rows, cols, data = [], [], []
+        for row, key in enumerate(keys):
+            for col, weight in cls._weights(entries[key].counts, vocab, idf).items():
+                rows.append(row)
+                cols.append(col)
+                data.append(weight)
+
+        if sparse is not None:
+            matrix = sparse.csr_matrix(
+                (np.array(data, dtype=np.float32), (rows, cols)), shape=(n, len(vocab))
+            )
+        else:
+            matrix: Dict[int, List[Tuple[int, float]]] = {}       # col → [(row, weight)]
+            for row, col, weight in zip(rows, cols, data):
+                matrix.setdefault(col, []).append((row, weight))
+        return keys, [entries[key] for key in keys], vocab, idf, matrix
+
+    @staticmethod
+    def _weights(counts: Counter, vocab: Dict[str, int], idf: Dict[str, float]) -> Dict[int, float]:
+        weights = {
+            vocab[term]: (1 + math.log(tf)) * idf[term]
+            for term, tf in counts.items() if term in vocab
+        }
+        norm = math.sqrt(sum(w * w for w in weights.values()))
+        return {col: w / norm for col, w in weights.items()} if norm else {}
+
+    def _scores(self, counts: Counter) -> Tuple[List[Key], List[_Entry], List[float]]:
+        if self._matrix is None:                 # only before the first rebuild()
+            self.rebuild()
+        keys, entries, vocab, idf, matrix = self._matrix
+        query = self._weights(counts, vocab, idf)
+        if not query:
+            return keys, entries, [0.0] * len(keys)
+
+        if sparse is not None:
+            vector = np.zeros(len(vocab), dtype=np.float32)
+            vector[list(query)] = list(query.values())
+            return keys, entries, (matrix @ vector).tolist()
+
+        scores = [0.0] * len(keys)
+        for col, weight in query.items():
+            for row, doc_weight in matrix.get(col, ()):
+                scores[row] += weight * doc_weight
+        return keys, entries, scores
+
+    # ── lookup ──────────────────────────────────────────────────────────────────
+    def _top(self, counts: Counter, limit: int, exclude: Optional[Key] = None) -> List[dict]:
+        keys, entries, scores = self._scores(counts)
+        ranked = sorted(
+            (i for i, score in enumerate(scores) if score > 0 and keys[i] != exclude),
+            key=lambda i: (-scores[i], keys[i]),
+        )[:limit]
+        hits = []
+        for i in ranked:
+            table, group_no = keys[i]
+            entry = entries[i]
+            hits.append({
+                "project_year": table.replace("_", "-"),
+                "group_no": group_no,
+                "project_title": entry.title,
+                "guide_name": entry.guide,
+                "score": round(float(scores[i]), 4),
+            })
+        return hits
+
+    def similar_to(self, table: str, group_no, limit: int = 10) -> Optional[List[dict]]:
+        """Projects most similar to one indexed project; None if it is unknown."""
+        key   = (table, str(group_no))
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        return self._top(entry.counts, limit, exclude=key)
+
+    def similar_text(self, text: str, limit: int = 10) -> List[dict]:
+        """Projects most similar to free text, e.g. a proposed title."""
+        return self._top(Counter(tokenize(text)), limit)
@@ -0,0 +1,48 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+from app.metrics import Counter
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key: the first caller (the
+    leader) runs ``compute()``, everyone arriving while it is in flight awaits
+    the same task.  Nothing is kept once it finishes – caching is the
+    response cache's job.
+
+    If the leader's request is cancelled (client went away) its task goes with
+    it; waiting callers then run the work themselves instead of failing.
+    """
+
+    def __init__(self, counter: Optional[Counter] = None):
+        self.counter = counter
+        self._calls: Dict[Hashable, asyncio.Task] = {}
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    def _count(self, endpoint: str, outcome: str) -> None:
+        if self.counter is not None:
+            self.counter.inc(endpoint=endpoint, outcome=outcome)
+
+    async def run(self, key: Hashable, compute: Callable[[], Awaitable[Any]], endpoint: str = "") -> Any:
+        task = self._calls.get(key)
+        if task is not None and not task.cancelled():
+            self._count(endpoint, "coalesced")
+            try:
+                return await asyncio.shield(task)
+            except asyncio.CancelledError:
+                if not task.cancelled():         # this caller was cancelled
+                    raise
+            # the leader was cancelled – the first waiter to get here takes over
+            return await self.run(key, compute, endpoint)
+
+        self._count(endpoint, "leader")
+        task = asyncio.ensure_future(compute())
+        self._calls[key] = task
+        try:
+            return await task
+        finally:
+            if self._calls.get(key) is task:
+                del self._calls[key]
@@ -0,0 +1,68 @@
+import os
+import time
+from collections import deque
+from typing import Any, Dict, List, Mapping, Optional
+
+
+SLOW_QUERY_MS       = float(os.getenv("SLOW_QUERY_MS", "200"))     # capture threshold, <0 = off
+SLOW_QUERY_LOG_SIZE = int(os.getenv("SLOW_QUERY_LOG_SIZE", "50"))  # entries kept
+SLOW_QUERY_EXPLAIN  = os.getenv("SLOW_QUERY_EXPLAIN", "true").strip().lower() in ("1", "true", "yes", "on")
+
+MAX_PARAM_LENGTH = 500           # long bind values are truncated in the log
+
+
+def _loggable(value: Any) -> Any:
+    if isinstance(value, str) and len(value) > MAX_PARAM_LENGTH:
+        return value[:MAX_PARAM_LENGTH] + "…"
+    if isinstance(value, (list, tuple)):
+        return [_loggable(v) for v in value]
+    return value
+
+
+class SlowQueryLog:
+    """
+    Bounded ring buffer of search/suggestion statements that took longer than
+    ``threshold_ms`` (or failed).  The EXPLAIN plan is attached later by the
+    caller, see ``app.routers.search.execute_search_sql``.
+    """
+
+    def __init__(self, threshold_ms: float = SLOW_QUERY_MS, size: int = SLOW_QUERY_LOG_SIZE):
+        self.threshold_ms = threshold_ms
+        self._entries: deque = deque(maxlen=size)
+        self._next_id = 1
+
+    def is_slow(self, seconds: float) -> bool:
+        return self.threshold_ms >= 0 and seconds * 1000 >= self.threshold_ms
+
+    def record(
+        self,
+        label: str,
+        sql: str,
+        params: Mapping[str, Any],
+        seconds: float,
+        error: Optional[str] = None
+    ) -> Dict[str, Any]:
+        entry = {
+            "id": self._next_id,
+            "label": label,
+            "at": time.time(),
+            "duration_ms": round(seconds * 1000, 3),
+            "sql": sql.strip(),
+            "params": {k: _loggable(v) for k, v in params.items()},
+            "error": error,
+            "plan": None,
+            "plan_status": "pending" if error is None and SLOW_QUERY_EXPLAIN else "skipped",
+        }
+        self._next_id += 1
+        self._entries.append(entry)
+        return entry
+
+    def entries(self) -> List[Dict[str, Any]]:
+        """Newest first."""
+        return list(reversed(self._entries))
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+slow_query_log = SlowQueryLog()
@@ -0,0 +1,197 @@
+import codecs
+import csv
+from collections import OrderedDict
+from typing import IO, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+
+# Column order of every imported year table (search_vector is generated)
+TABLE_COLUMNS = (
+    "group_no", "usn", "name", "project_title", "guide_name",
+    "outcomes", "proof_link", "report_links", "ppt_links",
+)
+
+# Header keywords per output column, tried in order (see find_column)
+COLUMN_KEYWORDS = (
+    ("group_no",      ["groupno", "group", "grp"]),
+    ("usn",           ["usn"]),
+    ("name",          ["name", "student"]),
+    ("project_title", ["projecttitle", "project"]),
+    ("guide_name",    ["guidename", "guide"]),
+    ("outcomes",      ["outcomes", "outcome", "result"]),
+    ("proof_link",    ["prooflink", "link"]),
+)
+
+HEADER_SCAN_ROWS     = 6          # the header is looked for in the first rows …
+DEFAULT_HEADER_ROW   = 3          # … and assumed here when no row says "GROUP NO"
+MAX_OPEN_GROUPS      = 512        # bound on groups buffered while streaming
+
+
+class SpreadsheetError(ValueError):
+    """The upload cannot be read or does not look like a project sheet."""
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# Readers – both yield one tuple of raw cell values per sheet row
+# ────────────────────────────────────────────────────────────────────────────────
+def read_rows(fileobj: IO[bytes], filename: str) -> Iterator[Sequence]:
+    """
+    Open an uploaded .csv or Excel workbook for streaming.  The file is read
+    row by row; only the workbook's zip directory is loaded up front.
+    """
+    fileobj.seek(0)
+    if filename.lower().endswith(".csv"):
+        return csv.reader(codecs.iterdecode(fileobj, "utf-8-sig"))
+
+    from openpyxl import load_workbook
+
+    try:
+        workbook = load_workbook(fileobj, read_only=True, data_only=True)
+    except Exception as exc:                     # noqa: BLE001 – any unreadable file
+        raise SpreadsheetError(f"File read error: {exc}") from exc
+    sheet = workbook.worksheets[0]
+    return sheet.iter_rows(values_only=True)
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# Cleaning helpers
+# ────────────────────────────────────────────────────────────────────────────────
+def is_blank(value) -> bool:
+    return value is None or (isinstance(value, str) and value == "")
+
+
+def normalize_column(value) -> str:
+    if is_blank(value):
+        return ""
+    return (
+        str(value).strip()
+                  .upper()
+                  .replace("\n", " ")
+                  .replace("\\N", "")
+                  .replace("\\", "")
+    )
+
+
+def find_column(columns: List[str], keywords: Iterable[str]) -> int:
+    """Index of the first column containing one of ``keywords`` (in order)."""
+    for keyword in keywords:
+        key_clean = keyword.lower().replace(" ", "").replace("_", "")
+        for i, col in enumerate(columns):
+            if key_clean in col.lower().replace(" ", "").replace("_", ""):
+                return i
+    raise SpreadsheetError(f"Missing column matching any of: {list(keywords)}")
+
+
+def parse_group_no(value) -> Optional[int]:
+    if is_blank(value):
+        return None
+    try:
+        number = float(str(value).strip())
+    except ValueError:
+        return None
+    if number != number:                          # NaN
+        return None
+    return int(number)
+
+
+def cell_text(value) -> str:
+    return "" if is_blank(value) else str(value)
+
+
+class _Group:
+    __slots__ = ("group_no", "lists", "firsts")
+
+    def __init__(self, group_no: int):
+        self.group_no = group_no
+        self.lists    = ([], [])                  # usn, name
+        self.firsts   = [None] * 4                # title, guide, outcomes, proof
+
+    def add(self, values: Sequence) -> None:
+        usn, name, *rest = values
+        for bucket, value in zip(self.lists, (usn, name)):
+            if not is_blank(value) and str(value).strip():
+                bucket.append(str(value))
+        for i, value in enumerate(rest):
+            if self.firsts[i] is None and not is_blank(value) and str(value).strip():
+                self.firsts[i] = value
+
+    def record(self) -> Tuple[str, ...]:
+        usn, name = (", ".join(bucket) for bucket in self.lists)
+        title, guide, outcomes, proof = (cell_text(v) for v in self.firsts)
+        return (str(self.group_no), usn, name, title, guide, outcomes, proof, "", "")
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# Streaming clean + group
+# ────────────────────────────────────────────────────────────────────────────────
+def iter_groups(
+    rows: Iterable[Sequence],
+    max_open_groups: int = MAX_OPEN_GROUPS
+) -> Iterator[Tuple[str, ...]]:
+    """
+    Turn raw sheet rows into one record per project group, in TABLE_COLUMNS
+    order, without holding the sheet in memory.
+
+    Same cleaning rules as before: find the "GROUP NO" header row, skip empty
+    rows, forward-fill merged cells, drop rows without a numeric group, then
+    collect every USN / name of a group and the first title, guide, outcome
+    and proof link.  Only ``max_open_groups`` groups are buffered, so a
+    group's rows must not be spread further apart than that.
+    """
+    rows = iter(rows)
+
+    head: List[Sequence] = []
+    header_row = None
+    for i, row in zip(range(HEADER_SCAN_ROWS), rows):
+        head.append(row)
+        vals = [str(v).upper() for v in row if not is_blank(v)]
+        if any("GROUP" in v and "NO" in v for v in vals):
+            header_row = i
+            break
+    if header_row is None:
+        header_row = DEFAULT_HEADER_ROW
+        if header_row >= len(head):
+            raise SpreadsheetError("No header row found in the uploaded file")
+
+    columns = [normalize_column(c) for c in head[header_row]]
+    indexes = [find_column(columns, keywords) for _, keywords in COLUMN_KEYWORDS]
+    width   = len(columns)
+
+    def data_rows():
+        yield from head[header_row + 1:]
+        yield from rows
+
+    last: List = [None] * width                   # forward-fill state
+    open_groups: "OrderedDict[int, _Group]" = OrderedDict()
+    closed = set()
+
+    for row in data_rows():
+        row = list(row[:width]) + [None] * (width - len(row))
+        if all(is_blank(v) for v in row):
+            continue
+        for i, value in enumerate(row):
+            if is_blank(value):
+                row[i] = last[i]
+            else:
+                last[i] = value
+
+        values   = [row[i] for i in indexes]
+        group_no = parse_group_no(values[0])
+        if group_no is None:
+            continue
+        if group_no in closed:
+            raise SpreadsheetError(
+                f"Rows of group {group_no} are too far apart; "
+                f"sort the sheet by group number and upload again"
+            )
+
+        group = open_groups.get(group_no)
+        if group is None:
+            if len(open_groups) >= max_open_groups:
+                _, oldest = open_groups.popitem(last=False)
+                closed.add(oldest.group_no)
+                yield oldest.record()
+            group = open_groups[group_no] = _Group(group_no)
+        group.add(values[1:])
+
+    for group in open_groups.values():
+        yield group.record()
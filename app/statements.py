@@ -0,0 +1,53 @@
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+STATEMENT_REGISTRY_SIZE = 512
+
+
+class StatementRegistry:
+    """
+    Built SQL statements keyed by query shape, e.g. ``(tables, search_type,
+    keyset)``.  Reusing the same statement object keeps the SQL text
+    byte-identical between requests, so each pooled asyncpg connection
+    prepares it once and then only binds parameters (see
+    DB_PREPARED_STATEMENT_CACHE_SIZE).
+
+    Entries are only valid for one schema-catalog ``version`` – the column
+    capabilities they were built from – and are all dropped as soon as a
+    lookup sees a newer one.
+    """
+
+    def __init__(self, maxsize: int = STATEMENT_REGISTRY_SIZE):
+        self.maxsize  = maxsize
+        self.hits     = 0
+        self.misses   = 0
+        self._version: Optional[int] = None
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable, version: int) -> Optional[Any]:
+        if version != self._version:
+            self._data.clear()
+            self._version = version
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, key: Hashable, version: int, statement: Any) -> None:
+        if version != self._version:
+            self._data.clear()
+            self._version = version
+        self._data[key] = statement
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        self._data.clear()
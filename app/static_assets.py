@@ -0,0 +1,153 @@
+import hashlib
+import mimetypes
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from app.cache import etag_matches
+from app.compression import brotli, choose_encoding, compress, is_compressible
+
+
+STATIC_DIR       = os.path.join(os.path.dirname(__file__), "static")
+STATIC_MAX_AGE   = int(os.getenv("STATIC_MAX_AGE", "3600"))        # seconds, /static/* assets
+MAX_CACHED_BYTES = 4 * 1024 * 1024         # larger files are read per request, uncompressed
+
+Headers = Dict[str, str]
+
+
+def byte_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    Inclusive ``(first, last)`` of a single ``Range: bytes=…`` header, or None
+    to send the whole body (no header, malformed or multiple ranges).
+    Raises ValueError when the range lies outside the body (→ 416).
+    """
+    unit, _, spec = (header or "").partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    first, sep, last = spec.strip().partition("-")
+    if not sep:
+        return None
+    if not first:                                        # "-N": the last N bytes
+        if not last.isdigit():
+            return None
+        if int(last) == 0 or size == 0:
+            raise ValueError("Unsatisfiable range")
+        return max(size - int(last), 0), size - 1
+    if not first.isdigit() or (last and not last.isdigit()):
+        return None
+    first, last = int(first), int(last) if last else size - 1
+    if first >= size:
+        raise ValueError("Unsatisfiable range")
+    if last < first:
+        return None
+    return first, min(last, size - 1)
+
+
+class StaticAsset:
+    """One file with its precompressed variants, each with its own content ETag."""
+
+    __slots__ = ("path", "mtime", "media_type", "etags", "bodies")
+
+    def __init__(self, path: str, mtime: float, body: bytes, precompress: bool = True):
+        self.path       = path
+        self.mtime      = mtime
+        self.media_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+        if self.media_type.startswith("text/"):
+            self.media_type += "; charset=utf-8"
+        self.bodies: Dict[Optional[str], bytes] = {None: body}
+        if precompress and is_compressible(self.media_type) and len(body) > 256:
+            # best compression once, at load time – not per request
+            self.bodies["gzip"] = compress(body, "gzip", 9)
+            if brotli is not None:
+                self.bodies["br"] = compress(body, "br", 11)
+        # each encoding is a different byte sequence, so a strong ETag apiece
+        digest     = hashlib.sha1(body).hexdigest()[:32]
+        self.etags = {
+            encoding: '"%s"' % digest if encoding is None else f'"{digest}-{encoding}"'
+            for encoding in self.bodies
+        }
+
+    def respond(
+        self,
+        if_none_match: Optional[str],
+        accept_encoding: Optional[str],
+        cache_control: str,
+        range_header: Optional[str] = None,
+        if_range: Optional[str] = None
+    ) -> Tuple[int, Headers, bytes]:
+        """
+        ``(status, headers, body)`` – 304 when the client's copy is current,
+        206 for a single byte range of the uncompressed file (416 if it lies
+        outside).  Range requests are always answered uncompressed.
+        """
+        if range_header and (if_range is None or if_range == self.etags[None]):
+            encoding = None
+        else:
+            encoding, range_header = choose_encoding(accept_encoding), None
+            if encoding not in self.bodies:
+                encoding = None
+        headers = {
+            "ETag": self.etags[encoding],
+            "Cache-Control": cache_control,
+            "Vary": "Accept-Encoding",
+            "Accept-Ranges": "bytes",
+        }
+        if etag_matches(if_none_match, self.etags[encoding]):
+            return 304, headers, b""
+        headers["Content-Type"] = self.media_type
+        body = self.bodies[encoding]
+        try:
+            span = byte_range(range_header, len(body))
+        except ValueError:
+            headers["Content-Range"] = f"bytes */{len(body)}"
+            return 416, headers, b""
+        if span is not None:
+            first, last = span
+            headers["Content-Range"] = f"bytes {first}-{last}/{len(body)}"
+            return 206, headers, body[first:last + 1]
+        if encoding:
+            headers["Content-Encoding"] = encoding
+        return 200, headers, body
+
+
+class StaticAssets:
+    """
+    In-memory copies of the files under ``root``, loaded on first request
+    and reloaded when the file's mtime changes (one stat per request).
+    ``get`` does blocking file I/O – async callers run it in a thread.
+    """
+
+    def __init__(self, root: str = STATIC_DIR):
+        self.root    = os.path.realpath(root)
+        self._lock   = threading.Lock()
+        self._assets: Dict[str, StaticAsset] = {}
+
+    def resolve(self, name: str) -> Optional[str]:
+        """Absolute path of ``name`` inside root, or None (missing / escapes root)."""
+        path = os.path.realpath(os.path.join(self.root, name))
+        if not path.startswith(self.root + os.sep) or not os.path.isfile(path):
+            return None
+        return path
+
+    def get(self, name: str) -> Optional[StaticAsset]:
+        path = self.resolve(name)
+        if path is None:
+            return None
+        stat  = os.stat(path)
+        asset = self._assets.get(path)
+        if asset is not None and asset.mtime == stat.st_mtime:
+            return asset
+        cache = stat.st_size <= MAX_CACHED_BYTES
+        with open(path, "rb") as fh:
+            asset = StaticAsset(path, stat.st_mtime, fh.read(), precompress=cache)
+        if cache:
+            with self._lock:
+                self._assets[path] = asset
+        return asset
+
+    def preload(self, names: List[str]) -> None:
+        for name in names:
+            self.get(name)
+
+
+static_assets = StaticAssets()
@@ -0,0 +1,151 @@
+import asyncio
+import os
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.bm25 import BM25Index
+from app.catalog import schema_catalog
+from app.prefix_index import PrefixIndex
+from app.similarity import SimilarityIndex
+
+
+# "postgres" (default) or "memory" – rank searches with the in-process BM25
+# index instead of Postgres full-text search (fuzzy search always uses SQL)
+SEARCH_BACKEND = os.getenv("SEARCH_BACKEND", "postgres").strip().lower()
+
+# Process-wide typeahead index; see build_suggestion_index()
+suggestion_index = PrefixIndex()
+
+# Process-wide search index, only filled when SEARCH_BACKEND == "memory"
+search_index = BM25Index()
+
+# Process-wide TF-IDF vectors for /projects/.../similar
+similar_index = SimilarityIndex()
+_similar_rebuild: Optional[asyncio.Task] = None
+
+
+async def _rebuild_similar() -> None:
+    # edits made while a matrix is being assembled are picked up by the next lap
+    while similar_index.stale:
+        entries, df, version = similar_index.snapshot()
+        try:
+            matrix = await asyncio.to_thread(SimilarityIndex.assemble, entries, df)
+        except Exception as exc:                 # noqa: BLE001 – keep serving the old matrix
+            print(f"[suggest] could not rebuild similarity matrix: {exc}")
+            return
+        similar_index.install(matrix, version)
+
+
+def schedule_similar_rebuild() -> None:
+    """
+    Re-assemble the similarity matrix in a worker thread after edits; lookups
+    serve the previous one meanwhile.  One rebuild at a time.
+    """
+    global _similar_rebuild
+    if _similar_rebuild is None or _similar_rebuild.done():
+        _similar_rebuild = asyncio.get_running_loop().create_task(_rebuild_similar())
+
+
+async def _fetch_rows(db: AsyncSession, table_name: str, group_no=None):
+    columns = await schema_catalog.columns(db, table_name)
+    if not {"group_no", "project_title", "guide_name"} <= set(columns):
+        return []
+
+    sql = f'SELECT group_no, project_title, guide_name FROM "{table_name}"'
+    params = {}
+    if group_no is not None:
+        sql += " WHERE group_no::text = :group_no"
+        params["group_no"] = str(group_no)
+    result = await db.execute(text(sql), params)
+    return result.all()
+
+
+async def _fetch_documents(db: AsyncSession, table_name: str, group_no=None):
+    columns = await schema_catalog.columns(db, table_name)
+    if not {"group_no", "project_title", "guide_name"} <= set(columns):
+        return []
+
+    sql = f'SELECT * FROM "{table_name}"'
+    params = {}
+    if group_no is not None:
+        sql += " WHERE group_no::text = :group_no"
+        params["group_no"] = str(group_no)
+    result = await db.execute(text(sql), params)
+    return result.mappings().all()
+
+
+async def _refresh_documents(db: AsyncSession, table_name: str) -> None:
+    """Whole rows feed the similarity index and, if enabled, the search index."""
+    records = await _fetch_documents(db, table_name)
+    similar_index.replace_table(table_name, records)
+    if SEARCH_BACKEND == "memory":
+        search_index.replace_table(table_name, records)
+
+
+async def _refresh_document_row(db: AsyncSession, table_name: str, group_no) -> None:
+    records = await _fetch_documents(db, table_name, group_no)
+    for index in (similar_index, search_index) if SEARCH_BACKEND == "memory" else (similar_index,):
+        index.delete_row(table_name, group_no)
+        for record in records:
+            index.upsert_row(table_name, record)
+
+
+async def build_suggestion_index(db: AsyncSession) -> None:
+    """
+    Load titles and guide names of every year table (run at startup), plus
+    whole rows into the similarity index and – when SEARCH_BACKEND ==
+    "memory" – the search index.
+    """
+    for table_name in await schema_catalog.year_tables(db):
+        try:
+            suggestion_index.replace_table(table_name, await _fetch_rows(db, table_name))
+            await _refresh_documents(db, table_name)
+        except Exception as exc:                 # noqa: BLE001 – want wide catch
+            print(f"[suggest] could not index {table_name}: {exc}")
+    schedule_similar_rebuild()
+    await _similar_rebuild
+    suggestion_index.ready = True
+    similar_index.ready    = True
+    search_index.ready     = SEARCH_BACKEND == "memory"
+
+
+async def refresh_table(db: AsyncSession, table_name: str) -> None:
+    """Re-read one table after an import."""
+    try:
+        suggestion_index.replace_table(table_name, await _fetch_rows(db, table_name))
+        await _refresh_documents(db, table_name)
+    except Exception as exc:                     # noqa: BLE001 – never fail the admin call
+        print(f"[suggest] could not refresh {table_name}: {exc}")
+    schedule_similar_rebuild()
+
+
+async def refresh_row(db: AsyncSession, table_name: str, group_no) -> None:
+    """Re-read one row after an insert/update; removes it if it is gone."""
+    try:
+        rows = await _fetch_rows(db, table_name, group_no)
+        await _refresh_document_row(db, table_name, group_no)
+    except Exception as exc:                     # noqa: BLE001 – never fail the admin call
+        print(f"[suggest] could not refresh {table_name}/{group_no}: {exc}")
+        return
+    finally:
+        schedule_similar_rebuild()
+    if not rows:
+        suggestion_index.delete_row(table_name, group_no)
+    for row_group, title, guide in rows:
+        suggestion_index.upsert_row(table_name, row_group, title, guide)
+
+
+def delete_row(table_name: str, group_no) -> None:
+    suggestion_index.delete_row(table_name, group_no)
+    search_index.delete_row(table_name, group_no)
+    similar_index.delete_row(table_name, group_no)
+    schedule_similar_rebuild()
+
+
+def drop_table(table_name: str) -> None:
+    suggestion_index.drop_table(table_name)
+    search_index.drop_table(table_name)
+    similar_index.drop_table(table_name)
+    schedule_similar_rebuild()
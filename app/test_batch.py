@@ -0,0 +1,60 @@
+import pytest
+
+from app.batch import BatchError, plan_batch
+
+TEXT_TABLE = {
+    "group_no": "text", "usn": "text", "project_title": "text",
+    "guide_name": "text", "search_vector": "tsvector",
+}
+MODEL_TABLE = {"group_no": "integer", "usn": "ARRAY", "project_title": "text"}
+
+
+def test_statements_run_deletes_then_updates_then_inserts():
+    statements = plan_batch("2024_25", {
+        "insert": [{"group_no": 7, "project_title": "New"}],
+        "update": [{"group_no": 3, "data": {"guide_name": "Dr. X"}}],
+        "delete": [5, "6"],
+    }, TEXT_TABLE)
+    kinds = [sql.split()[0] for sql, _ in statements]
+    assert kinds == ["DELETE", "UPDATE", "INSERT"]
+    assert statements[0][1] == [{"group_no": "5"}, {"group_no": "6"}]
+    assert statements[1][1] == [{"guide_name": "Dr. X", "where_group_no": "3"}]
+    assert statements[2][1] == [{"group_no": "7", "project_title": "New"}]
+
+
+def test_rows_with_same_columns_share_one_executemany():
+    statements = plan_batch("2024_25", {"insert": [
+        {"group_no": 1, "project_title": "A"},
+        {"project_title": "B", "group_no": 2},
+        {"group_no": 3},
+    ]}, TEXT_TABLE)
+    assert [len(params) for _, params in statements] == [2, 1]
+
+
+def test_generated_columns_are_dropped_and_lists_follow_column_type():
+    (sql, params), = plan_batch(
+        "2024_25",
+        {"update": [{"group_no": 1, "data": {"usn": ["1A", "1B"], "search_vector": "x"}}]},
+        TEXT_TABLE, generated={"search_vector"},
+    )
+    assert "search_vector" not in sql
+    assert params == [{"usn": "1A, 1B", "where_group_no": "1"}]
+
+    (_, params), = plan_batch("p", {"insert": [{"group_no": "4", "usn": ["1A"]}]}, MODEL_TABLE)
+    assert params == [{"group_no": 4, "usn": ["1A"]}]
+
+
+@pytest.mark.parametrize("batch", [
+    {},
+    {"upsert": [{}]},
+    {"insert": [{"no_such_column": 1}]},
+    {"update": [{"data": {"project_title": "x"}}]},
+])
+def test_invalid_batches(batch):
+    with pytest.raises(BatchError):
+        plan_batch("2024_25", batch, TEXT_TABLE)
+
+
+def test_integer_group_no_must_be_numeric():
+    with pytest.raises(BatchError, match="group_no"):
+        plan_batch("2024_25", {"insert": [{"group_no": "abc"}]}, MODEL_TABLE)
@@ -0,0 +1,66 @@
+from app.bm25 import BM25Index, facet_counts, tokenize
+
+
+def row(group_no, title, guide, **extra):
+    return {"group_no": group_no, "project_title": title, "guide_name": guide, **extra}
+
+
+def make_index():
+    index = BM25Index()
+    index.replace_table("2023_24", [
+        row(1, "Machine Learning for Crop Yield", "Dr. Kumar", usn=["1AB001", "1AB002"]),
+        row(2, "Smart Parking System", "Prof. Learning"),
+        row(10, "Crop Disease Detection", "Dr. Rao"),
+    ])
+    index.replace_table("2024_25", [
+        row(1, "Deep Learning Systems", "Dr. Kumar"),
+    ])
+    return index
+
+
+def test_tokenize_stems_and_drops_stopwords():
+    assert tokenize("The Learning of Systems") == ["learn", "system"]
+
+
+def test_every_term_must_match():
+    index = make_index()
+    titles = [doc.get("project_title") for _, doc in index.search("crop learning")]
+    assert titles == ["Machine Learning for Crop Yield"]
+    assert index.search("crop blockchain") == []
+
+
+def test_title_outranks_guide():
+    index = make_index()
+    hits = index.search("learning", tables=["2023_24"])
+    assert [doc.group_no for _, doc in hits] == ["1", "2"]
+    assert hits[0][0] > hits[1][0]
+
+    guides = index.search("learning", search_type="guide")
+    assert [doc.group_no for _, doc in guides] == ["2"]
+
+
+def test_documents_keep_text_values():
+    doc = make_index().search("yield")[0][1]
+    assert doc.project_year == "2023-24"
+    assert doc.get("usn") == "1AB001, 1AB002"
+    assert doc.get("ppt_links") == "" and doc.get("outcomes") is None
+
+
+def test_incremental_updates():
+    index = make_index()
+    index.upsert_row("2023_24", row(10, "Traffic Monitoring", "Dr. Rao"))
+    assert [doc.group_no for _, doc in index.search("crop")] == ["1"]
+    assert len(index.search("traffic")) == 1
+
+    index.delete_row("2023_24", 1)
+    index.drop_table("2024_25")
+    assert [doc.group_no for _, doc in index.search("learning")] == ["2"]
+    assert len(index) == 2
+
+
+def test_facet_counts():
+    docs = [doc for _, doc in make_index().search("learning")]
+    assert facet_counts(docs) == {
+        "years": [{"value": "2023-24", "count": 2}, {"value": "2024-25", "count": 1}],
+        "guides": [{"value": "Dr. Kumar", "count": 2}, {"value": "Prof. Learning", "count": 1}],
+    }
@@ -0,0 +1,62 @@
+from app.cache import DataVersion, TTLCache, etag_matches, make_etag, normalize_query
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_lru_eviction():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+
+
+def test_entries_expire():
+    clock = FakeClock()
+    cache = TTLCache(maxsize=10, ttl=5, clock=clock)
+    cache.set("a", 1)
+    clock.now = 4.9
+    assert cache.get("a") == 1
+    clock.now = 5.0
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_etags():
+    etag = make_etag(3, "search", "all", "iot")
+    assert etag == make_etag(3, "search", "all", "iot")
+    assert etag != make_etag(4, "search", "all", "iot")
+    assert etag_matches(f'"other", {etag}', etag)
+    assert etag_matches("*", etag)
+    assert etag_matches(f"W/{etag}", etag)
+    assert not etag_matches(None, etag)
+
+
+def test_normalize_query():
+    assert normalize_query("  Machine   LEARNING ") == "machine learning"
+
+
+def test_data_version():
+    first, second = DataVersion(), DataVersion()
+    assert first.value != second.value           # per-boot nonce
+
+    assert not first.observe((10, 3))            # first reading is the baseline
+    assert not first.observe((10, 3))
+    before = first.value
+    assert first.observe((12, 3))                # written from elsewhere
+    assert first.value != before
+
+
+def test_data_version_changing():
+    version = DataVersion()
+    with version.changing():
+        during = version.value
+    assert during != version.value               # bumped again once refreshed
@@ -0,0 +1,124 @@
+import asyncio
+import gzip
+import zlib
+
+from app.compression import CompressionMiddleware, choose_encoding
+from app.static_assets import StaticAssets
+
+
+def run(app, accept="gzip"):
+    scope = {"type": "http", "headers": [(b"accept-encoding", accept.encode())]}
+    sent  = []
+
+    async def receive():
+        return {"type": "http.request"}
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(CompressionMiddleware(app, minimum_size=100)(scope, receive, send))
+    return dict(sent[0]["headers"]), b"".join(m.get("body", b"") for m in sent[1:])
+
+
+def json_app(body, chunks=1):
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            (b"etag", b'"abc"'),
+        ]})
+        size = len(body) // chunks + 1
+        for i in range(chunks):
+            part = body[i * size:(i + 1) * size]
+            await send({"type": "http.response.body", "body": part, "more_body": i < chunks - 1})
+    return app
+
+
+def test_streamed_chunks_are_flushed():
+    lines = [b'{"group_no": "%d", "project_title": "Smart Parking"}\n' % i for i in range(3)]
+    sent  = []
+
+    async def ndjson_app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": [
+            (b"content-type", b"application/x-ndjson"),
+        ]})
+        for line in lines:
+            await send({"type": "http.response.body", "body": line, "more_body": True})
+        await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+    async def receive():
+        return {"type": "http.request"}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "headers": [(b"accept-encoding", b"gzip")]}
+    asyncio.run(CompressionMiddleware(ndjson_app, minimum_size=100)(scope, receive, send))
+
+    # the first line is readable before the body has ended
+    first = sent[1]
+    assert first["more_body"] and first["body"]
+    assert zlib.decompressobj(31).decompress(first["body"]) == lines[0]
+    assert gzip.decompress(b"".join(m["body"] for m in sent[1:])) == b"".join(lines)
+
+
+def test_choose_encoding():
+    assert choose_encoding("gzip, deflate") == "gzip"
+    assert choose_encoding("gzip;q=0, identity") is None
+    assert choose_encoding(None) is None
+
+
+def test_large_bodies_are_gzipped():
+    body = b'{"results": [' + b'"Machine Learning", ' * 50 + b'""]}'
+    headers, data = run(json_app(body))
+    assert headers[b"content-encoding"] == b"gzip"
+    assert headers[b"etag"] == b'W/"abc"'
+    assert int(headers[b"content-length"]) == len(data)
+    assert gzip.decompress(data) == body
+
+
+def test_streams_and_small_bodies():
+    body = b"x" * 1000
+    headers, data = run(json_app(body, chunks=4))
+    assert b"content-length" not in headers
+    assert gzip.decompress(data) == body
+
+    headers, data = run(json_app(b"{}"))
+    assert b"content-encoding" not in headers and data == b"{}"
+
+    headers, data = run(json_app(body), accept="identity")
+    assert b"content-encoding" not in headers and data == body
+
+
+def test_static_assets(tmp_path):
+    page = b"<html>" + b"<p>Project portal</p>" * 100 + b"</html>"
+    (tmp_path / "index.html").write_bytes(page)
+    assets = StaticAssets(str(tmp_path))
+    asset  = assets.get("index.html")
+    assert assets.get("../secret.txt") is None and assets.get("missing.html") is None
+
+    status, headers, body = asset.respond(None, "gzip", "no-cache")
+    assert status == 200 and headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(body) == page
+
+    status, headers, body = asset.respond(headers["ETag"], "gzip", "no-cache")
+    assert status == 304 and body == b""
+    assert assets.get("index.html") is asset
+
+
+def test_static_asset_encodings_and_ranges(tmp_path):
+    page = b"0123456789" * 100
+    (tmp_path / "app.js").write_bytes(page)
+    asset = StaticAssets(str(tmp_path)).get("app.js")
+
+    _, identity, _ = asset.respond(None, None, "no-cache")
+    _, gzipped, _  = asset.respond(None, "gzip", "no-cache")
+    assert identity["ETag"] != gzipped["ETag"]
+    assert asset.respond(identity["ETag"], "gzip", "no-cache")[0] == 200
+
+    status, headers, body = asset.respond(None, "gzip", "no-cache", "bytes=10-19")
+    assert status == 206 and body == page[10:20] and "Content-Encoding" not in headers
+    assert headers["Content-Range"] == "bytes 10-19/1000"
+    assert asset.respond(None, None, "no-cache", "bytes=-5")[2] == page[-5:]
+    assert asset.respond(None, None, "no-cache", "bytes=2000-")[0] == 416
+    assert asset.respond(None, None, "no-cache", "bytes=0-1", if_range='"stale"')[0] == 200
@@ -0,0 +1,30 @@
+from app.indexes import index_name, search_index_statements
+
+
+def test_short_names_are_unchanged():
+    assert index_name("2024_25", "search") == "idx_2024_25_search"
+
+
+def test_long_names_stay_distinct_and_valid():
+    table = "x" * 63
+    title = index_name(table, "title_fts")
+    guide = index_name(table, "guide_fts")
+    assert title != guide
+    assert len(title) <= 63 and len(guide) <= 63
+
+
+def test_statements_cover_every_search_mode():
+    ddl = " ".join(search_index_statements("2024_25"))
+    for suffix in ("search", "title_fts", "guide_fts", "group_no"):
+        assert f"idx_2024_25_{suffix}" in ddl
+
+
+def test_plain_search_vector_is_replaced_by_a_generated_column():
+    ddl = search_index_statements("2024_25")
+    assert any("GENERATED ALWAYS" in stmt for stmt in ddl)
+    assert not any("GENERATED" in stmt for stmt in search_index_statements("2024_25", generate=False))
+
+
+def test_group_no_index_matches_the_admin_page_order():
+    ddl = search_index_statements("2024_25", generate=False)[-1]
+    assert ddl.endswith('ON "2024_25" ((length(group_no::text)), (group_no::text))')
@@ -0,0 +1,39 @@
+import asyncio
+
+from app.jobs import JobRunner
+
+
+def test_job_progress_and_result():
+    async def main():
+        runner = JobRunner()
+
+        async def work(job):
+            job.phase, job.rows_processed = "loading", 10
+            await asyncio.sleep(0)
+            return {"rows_imported": 10}
+
+        job = runner.submit("import", "2024_25", work)
+        assert job.phase == "queued"
+        await runner.wait(job.id)
+        return runner.get(job.id)
+
+    job = asyncio.run(main())
+    assert job.phase == "done" and job.finished
+    assert job.rows_processed == 10
+    assert job.to_dict()["result"] == {"rows_imported": 10}
+
+
+def test_failed_job_keeps_error():
+    async def main():
+        runner = JobRunner()
+
+        async def work(job):
+            raise ValueError("Missing column matching any of: ['usn']")
+
+        job = runner.submit("import", "2024_25", work)
+        await runner.wait(job.id)
+        return job
+
+    job = asyncio.run(main())
+    assert job.phase == "failed"
+    assert "usn" in job.error
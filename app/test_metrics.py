@@ -0,0 +1,50 @@
+import asyncio
+
+from app.metrics import Histogram, TimingMiddleware, WaitStats, registry, timed
+
+
+def test_wait_stats_snapshot():
+    stats = WaitStats()
+    assert stats.snapshot()["avg_seconds"] == 0.0
+
+    stats.record(0.5)
+    stats.record(1.5, error=True)
+    snap = stats.snapshot()
+    assert snap["count"] == 2 and snap["errors"] == 1
+    assert snap["avg_seconds"] == 1.0
+    assert snap["max_seconds"] == 1.5 and snap["last_seconds"] == 1.5
+
+    stats.reset()
+    assert stats.snapshot()["count"] == 0
+
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = Histogram("t_seconds", "Test.", ("route",), buckets=(0.1, 1.0))
+    histogram.observe(0.05, route="/api/search/")
+    histogram.observe(0.5, route="/api/search/")
+    lines = histogram.render()
+    assert 't_seconds_bucket{route="/api/search/",le="0.1"} 1' in lines
+    assert 't_seconds_bucket{route="/api/search/",le="1.0"} 2' in lines
+    assert 't_seconds_bucket{route="/api/search/",le="+Inf"} 2' in lines
+    assert 't_seconds_count{route="/api/search/"} 2' in lines
+
+
+def test_middleware_adds_server_timing_for_timed_phases():
+    sent = []
+
+    async def endpoint(scope, receive, send):
+        with timed("query", table="2024_25", search_type="all"):
+            pass
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"{}"})
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "method": "GET", "path": "/api/search/"}
+    asyncio.run(TimingMiddleware(endpoint)(scope, None, send))
+
+    header = dict(sent[0]["headers"])[b"server-timing"].decode()
+    assert header.startswith("query;dur=") and "total;dur=" in header
+    assert 'portal_phase_seconds_count{route="unmatched",phase="query",table="2024_25",search_type="all"}' \
+        in registry.render()
@@ -0,0 +1,36 @@
+from app.minhash import LSHIndex, NUM_PERM, normalize_title, signature, similarity
+
+
+def sig(title):
+    return signature(normalize_title(title))
+
+
+def test_signature_is_stable_and_normalised():
+    a = sig("Crop Disease Detection using CNN")
+    assert len(a) == NUM_PERM
+    assert a == sig("crop disease detection, using CNN!")
+    assert signature(normalize_title("  --  ")) is None
+
+
+def test_similarity_tracks_title_overlap():
+    base = sig("Crop Disease Detection using Deep Learning")
+    near = sig("Crop Disease Detection using Deep Learning Techniques")
+    far  = sig("Smart Parking Management System")
+    assert similarity(base, base) == 1.0
+    assert similarity(base, near) > 0.6
+    assert similarity(base, far) < 0.3
+
+
+def test_lsh_returns_only_close_titles():
+    index = LSHIndex()
+    titles = [
+        "Crop Disease Detection using Deep Learning",
+        "Smart Parking Management System",
+        "Blockchain Based Voting Platform",
+    ]
+    for i, title in enumerate(titles):
+        index.add(i, sig(title))
+
+    matches = index.query(sig("Crop Disease Detection using Deep Learning Techniques"), 0.6)
+    assert [item for item, _ in matches] == [0]
+    assert index.query(sig("Federated Learning for Air Quality"), 0.6) == []
@@ -0,0 +1,46 @@
+import pytest
+
+from app.pagination import decode_cursor, encode_cursor, parse_fields, select_columns
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor(0.0607927, "2024-25", "12")
+    assert decode_cursor(cursor) == (0.0607927, "2024-25", "12")
+
+
+def test_empty_cursor_is_first_page():
+    assert decode_cursor(None) is None
+    assert decode_cursor("") is None
+
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", encode_cursor(1, "x", "y")[:-3]])
+def test_malformed_cursor(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+TABLE = ["group_no", "usn", "project_title", "search_vector"]
+
+
+def test_select_columns_hides_search_vector_by_default():
+    assert select_columns(None, TABLE) == ["group_no", "usn", "project_title"]
+
+
+def test_select_columns_keeps_table_order_and_group_no():
+    assert select_columns("project_title, usn", TABLE) == ["group_no", "usn", "project_title"]
+    assert select_columns("search_vector", TABLE) == ["group_no", "search_vector"]
+
+
+def test_select_columns_rejects_unknown():
+    with pytest.raises(ValueError, match="nope"):
+        select_columns("usn,nope", TABLE)
+
+
+def test_parse_fields_canonical_order():
+    allowed = ("group_no", "usn", "project_title", "project_year")
+    assert parse_fields(None, allowed) == allowed
+    assert parse_fields("project_year, group_no,project_title", allowed) == (
+        "group_no", "project_title", "project_year"
+    )
+    with pytest.raises(ValueError, match="ppt"):
+        parse_fields("ppt", allowed)
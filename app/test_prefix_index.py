@@ -0,0 +1,56 @@
+from app.prefix_index import PrefixIndex
+
+
+def make_index():
+    index = PrefixIndex()
+    index.replace_table("2023_24", [
+        (1, "Machine Learning for Crop Yield", "Dr. Kumar"),
+        (2, "Smart Parking System", "Prof. Machado"),
+    ])
+    index.replace_table("2024_25", [
+        (1, "Blockchain Voting System", "Dr. Kumar"),
+    ])
+    return index
+
+
+def test_partial_word_matches():
+    index = make_index()
+    assert index.suggest("mach") == [
+        "Machine Learning for Crop Yield",
+        "Prof. Machado",
+    ]
+    assert index.suggest("mach lear") == ["Machine Learning for Crop Yield"]
+
+
+def test_filters_by_table_and_field():
+    index = make_index()
+    assert index.suggest("system", tables=["2024_25"]) == ["Blockchain Voting System"]
+    assert index.suggest("kum", fields=["project_title"]) == []
+    assert index.suggest("kum", fields=["guide_name"]) == ["Dr. Kumar"]
+
+
+def test_incremental_updates():
+    index = make_index()
+    index.upsert_row("2024_25", 1, "Federated Learning Toolkit", "Dr. Rao")
+    assert index.suggest("block") == []
+    assert "Federated Learning Toolkit" in index.suggest("learn")
+
+    index.delete_row("2023_24", 1)
+    assert index.suggest("crop") == []
+
+    index.drop_table("2023_24")
+    assert index.suggest("park") == []
+    assert len(index) == 2
+
+
+def test_replace_table_merges_with_other_tables():
+    index = make_index()
+    index.replace_table("2023_24", [
+        (1, "Crop Yield Prediction", "Dr. Kumar"),
+        (1, "Soil Moisture Sensing", "Dr. Kumar"),          # repeated group: last row wins
+    ])
+    assert index.suggest("crop") == []
+    assert index.suggest("soil") == ["Soil Moisture Sensing"]
+    assert index.suggest("kum") == ["Dr. Kumar"]
+    assert index._keys == sorted(index._keys)
+    assert len(index) == 4
@@ -0,0 +1,117 @@
+import json
+import re
+
+from app.pagination import decode_cursor
+from app.search_sql import FACET_GUIDES, build_search_branch, plan_search, search_page
+
+TEXT_TABLE = {
+    "group_no": "text", "usn": "text", "name": "text", "project_title": "text",
+    "guide_name": "text", "outcomes": "text", "proof_link": "text", "search_vector": "tsvector",
+}
+MODEL_TABLE = {**TEXT_TABLE, "group_no": "integer", "usn": "ARRAY", "name": "ARRAY", "ppt_links": "text"}
+PARENT = {**TEXT_TABLE, "project_year": "text"}
+
+
+def binds(sql):
+    return set(re.findall(r"(?<!:):([a-z_0-9]+)", sql))
+
+
+def test_one_year():
+    sql, params = plan_search(["2024_25"], {"2024_25": TEXT_TABLE}, {})
+    assert params == {}
+    assert sql.count("WITH hits AS") == 1 and "UNION ALL" not in sql
+    assert 'FROM "2024_25"' in sql and "'2024-25'::text AS project_year" in sql
+    assert "search_vector @@ plainto_tsquery('english', :search_term)" in sql
+    assert binds(sql) == {"search_term", "limit"}
+
+
+def test_all_years_is_one_statement():
+    tables  = ["2022_23", "2023_24", "2024_25"]
+    columns = {"2022_23": MODEL_TABLE, "2023_24": TEXT_TABLE, "2024_25": TEXT_TABLE}
+    sql, _ = plan_search(tables, columns, {})
+    # every year in the same statement – no round trip per year
+    assert sql.count("WITH hits AS") == 1
+    assert sql.count(" UNION ALL ") == len(tables) - 1
+    for table in tables:
+        assert f'FROM "{table}"' in sql
+    assert "array_to_string(usn, ', ') AS usn" in sql
+    assert "LEFT JOIN LATERAL" in sql and "LIMIT :limit" in sql
+
+
+def test_unsearchable_tables_are_skipped():
+    sql, _ = plan_search(["2024_25", "odd"], {"2024_25": TEXT_TABLE, "odd": {"group_no": "text"}}, {})
+    assert 'FROM "odd"' not in sql and " UNION ALL " not in sql
+    assert plan_search(["odd"], {"odd": {}}, {}) == (None, {})
+
+
+def test_partitions_are_searched_through_their_parent():
+    parents = {"2023_24": "projects", "2024_25": "projects"}
+    columns = {"projects": PARENT, "2021_22": TEXT_TABLE}
+    sql, params = plan_search(["2021_22", "2023_24", "2024_25"], columns, parents)
+    assert params == {"partition_years_0": ["2023_24", "2024_25"]}
+    assert sql.count('FROM "projects"') == 1 and 'FROM "2023_24"' not in sql
+    assert "project_year = ANY(:partition_years_0)" in sql
+    assert sql.count(" UNION ALL ") == 1
+    assert binds(sql) == {"search_term", "limit", "partition_years_0"}
+
+
+def test_keyset_page():
+    sql, _ = plan_search(["2024_25"], {"2024_25": TEXT_TABLE}, {}, keyset=True)
+    assert binds(sql) == {"search_term", "limit", "after_rank", "after_year", "after_group"}
+    assert sql.index("CAST(:after_rank AS real)") < sql.index("LIMIT :limit")
+
+
+def test_search_types_and_fields():
+    fuzzy = build_search_branch("2024_25", TEXT_TABLE, "fuzzy")
+    assert ":search_term <% project_title" in fuzzy and "word_similarity" in fuzzy
+    title = build_search_branch("2024_25", TEXT_TABLE, "title", fields=("project_title",))
+    assert "to_tsvector('english', COALESCE(project_title, ''))" in title
+    assert "project_title::text AS project_title" in title and "AS usn" not in title
+
+    sql, _ = plan_search(["2024_25"], {"2024_25": TEXT_TABLE}, {}, fields=("project_title",))
+    assert "page.rank, page.project_year, page.group_no, page.project_title" in sql
+
+
+def test_facets_come_from_the_hits_cte():
+    fields = ("project_title",)
+    plain, _ = plan_search(["2024_25"], {"2024_25": TEXT_TABLE}, {}, fields=fields)
+    assert "year_facets" not in plain and "guide_name" not in plain
+
+    for keyset in (False, True):
+        sql, _ = plan_search(["2024_25"], {"2024_25": TEXT_TABLE}, {}, keyset=keyset, fields=fields, facets=True)
+        assert sql.count("WITH hits AS") == 1
+        # the guide facet groups on guide_name, so the branch selects it
+        assert "guide_name::text AS guide_name" in sql
+        facet_part = sql[sql.index("count(*) AS hits"):sql.index("LEFT JOIN LATERAL")]
+        assert "GROUP BY project_year" in facet_part and f"LIMIT  {FACET_GUIDES}" in facet_part
+        # counts cover every hit, only the page is cut at the cursor
+        assert "after_rank" not in facet_part
+        assert ("CAST(:after_rank AS real)" in sql) == keyset
+        assert sql.rstrip().endswith("page.group_no ASC")
+        assert "total.year_facets, total.guide_facets" in sql
+
+
+def test_search_page_shape():
+    fields = ("project_title", "project_year")
+    years  = json.dumps([{"value": "2023-24", "count": 2}, {"value": "2024-25", "count": 1}])
+    guides = json.dumps([{"value": "Dr. Rao", "count": 3}])
+    rows = [
+        (3, 0.9, "2024-25", "1", "Smart Parking", years, guides),
+        (3, 0.5, "2023-24", "2", "Parking Sensor", years, guides),
+        (3, 0.1, "2023-24", "7", "Parking App", years, guides),
+    ]
+    page = search_page(rows, 2, fields, facets=True)
+    assert page["results"] == [
+        {"project_title": "Smart Parking", "project_year": "2024-25"},
+        {"project_title": "Parking Sensor", "project_year": "2023-24"},
+    ]
+    assert page["total"] == 3
+    assert decode_cursor(page["next_cursor"]) == (0.5, "2023-24", "2")
+    assert page["facets"] == {"years": json.loads(years), "guides": json.loads(guides)}
+
+    # the LEFT JOIN row of a page past the end still carries total and facets
+    empty = search_page([(3, None, None, None, None, years, None)], 2, fields, facets=True)
+    assert empty["results"] == [] and empty["total"] == 3 and empty["next_cursor"] is None
+    assert empty["facets"] == {"years": json.loads(years), "guides": []}
+
+    assert "facets" not in search_page([], 2, fields)
@@ -0,0 +1,50 @@
+from app.similarity import SimilarityIndex
+
+
+def row(group_no, title, outcomes="", guide="Dr. Rao"):
+    return {"group_no": group_no, "project_title": title, "outcomes": outcomes, "guide_name": guide}
+
+
+def make_index():
+    index = SimilarityIndex()
+    index.replace_table("2023_24", [
+        row(1, "Crop Disease Detection using Deep Learning", "Paper published"),
+        row(2, "Smart Parking System", "Prototype"),
+    ])
+    index.replace_table("2024_25", [
+        row(1, "Deep Learning Based Crop Disease Detection"),
+        row(2, "Traffic Signal Monitoring"),
+    ])
+    return index
+
+
+def test_similar_to_project_excludes_itself():
+    hits = make_index().similar_to("2023_24", 1)
+    assert [(h["project_year"], h["group_no"]) for h in hits] == [("2024-25", "1")]
+    assert 0 < hits[0]["score"] <= 1
+    assert make_index().similar_to("2023_24", 99) is None
+
+
+def test_similar_text():
+    hits = make_index().similar_text("parking system for campus", limit=1)
+    assert [h["project_title"] for h in hits] == ["Smart Parking System"]
+    assert make_index().similar_text("blockchain") == []
+
+
+def test_incremental_updates():
+    index = make_index()
+    assert index.stale
+    index.rebuild()
+    assert not index.stale
+    built = index.built_version
+    index.upsert_row("2024_25", row(2, "Smart Parking Using IoT"))
+    assert index.stale and index.built_version == built
+    assert index.similar_to("2023_24", 2) == []          # previous matrix until rebuilt
+    index.rebuild()
+    assert index.built_version != built
+    assert [h["group_no"] for h in index.similar_to("2023_24", 2)] == ["2"]
+
+    index.drop_table("2024_25")
+    index.rebuild()
+    assert index.similar_to("2023_24", 1) == []
+    assert len(index) == 2
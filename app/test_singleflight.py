@@ -0,0 +1,52 @@
+import asyncio
+
+from app.metrics import Counter
+from app.singleflight import SingleFlight
+
+
+def test_concurrent_calls_share_one_computation():
+    counter = Counter("test_singleflight_total", "test", ("endpoint", "outcome"))
+    flights = SingleFlight(counter)
+    calls   = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return b"body"
+
+    async def main():
+        results = await asyncio.gather(*(flights.run("k", compute, "search") for _ in range(5)))
+        again   = await flights.run("k", compute, "search")
+        return results, again
+
+    results, again = asyncio.run(main())
+    assert results == [b"body"] * 5 and again == b"body"
+    assert len(calls) == 2 and len(flights) == 0
+    assert counter.value(endpoint="search", outcome="leader") == 2
+    assert counter.value(endpoint="search", outcome="coalesced") == 4
+
+
+def test_errors_reach_every_waiter_and_cancelled_leader_is_replaced():
+    flights = SingleFlight()
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    async def slow():
+        await asyncio.sleep(0.02)
+        return "ok"
+
+    async def main():
+        errors = await asyncio.gather(*(flights.run("e", fail) for _ in range(3)), return_exceptions=True)
+
+        leader   = asyncio.ensure_future(flights.run("c", slow))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(flights.run("c", slow))
+        await asyncio.sleep(0)
+        leader.cancel()
+        return errors, await follower
+
+    errors, result = asyncio.run(main())
+    assert all(isinstance(e, ValueError) for e in errors)
+    assert result == "ok"
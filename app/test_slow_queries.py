@@ -0,0 +1,22 @@
+from app.slow_queries import MAX_PARAM_LENGTH, SlowQueryLog
+
+
+def test_threshold_and_disabled_log():
+    log = SlowQueryLog(threshold_ms=100)
+    assert log.is_slow(0.1) and not log.is_slow(0.099)
+    assert not SlowQueryLog(threshold_ms=-1).is_slow(60)
+
+
+def test_ring_buffer_keeps_newest_entries_first():
+    log = SlowQueryLog(threshold_ms=0, size=2)
+    for i in range(3):
+        log.record(f"search/all/{i}", " SELECT 1 ", {"search_term": "x" * (MAX_PARAM_LENGTH + 5)}, 0.5)
+    entries = log.entries()
+    assert [e["label"] for e in entries] == ["search/all/2", "search/all/1"]
+    assert entries[0]["sql"] == "SELECT 1" and entries[0]["duration_ms"] == 500.0
+    assert len(entries[0]["params"]["search_term"]) == MAX_PARAM_LENGTH + 1
+
+
+def test_failed_statements_skip_explain():
+    entry = SlowQueryLog().record("suggest/all/2024_25", "SELECT", {}, 0.01, error="boom")
+    assert entry["error"] == "boom" and entry["plan_status"] == "skipped"
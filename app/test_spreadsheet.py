@@ -0,0 +1,48 @@
+import io
+
+import pytest
+
+from app.spreadsheet import SpreadsheetError, iter_groups, read_rows
+
+
+SHEET = (
+    "DEPARTMENT OF ISE,,,,,,\n"
+    "Project list 2024-25,,,,,,\n"
+    "GROUP NO,USN,STUDENT NAME,PROJECT TITLE,GUIDE NAME,OUTCOMES,PROOF LINK\n"
+    "1,1XX21IS001,Asha,Crop Yield Prediction,Dr. Kumar,Paper,http://a\n"
+    ",1XX21IS002,Bharath,,,,\n"
+    ",,,,,,\n"
+    "2,1XX21IS003,Chetan,Smart Parking,Prof. Rao,,\n"
+    "Total,,,,,,\n"
+)
+
+
+def groups(text, **kwargs):
+    rows = read_rows(io.BytesIO(text.encode()), "projects.csv")
+    return list(iter_groups(rows, **kwargs))
+
+
+def test_groups_are_merged_and_forward_filled():
+    assert groups(SHEET) == [
+        ("1", "1XX21IS001, 1XX21IS002", "Asha, Bharath", "Crop Yield Prediction",
+         "Dr. Kumar", "Paper", "http://a", "", ""),
+        # outcome/proof are forward-filled from group 1 like any merged cell
+        ("2", "1XX21IS003", "Chetan", "Smart Parking", "Prof. Rao", "Paper", "http://a", "", ""),
+    ]
+
+
+def test_missing_column_is_reported():
+    with pytest.raises(SpreadsheetError):
+        groups("GROUP NO,USN,STUDENT NAME\n1,X,Y\n")
+
+
+def test_scattered_groups_beyond_buffer_are_rejected():
+    sheet = (
+        "GROUP NO,USN,NAME,PROJECT,GUIDE,OUTCOME,LINK\n"
+        "1,a,A,T1,G,O,L\n"
+        "2,b,B,T2,G,O,L\n"
+        "1,c,C,T1,G,O,L\n"
+    )
+    assert len(groups(sheet)) == 2
+    with pytest.raises(SpreadsheetError):
+        groups(sheet, max_open_groups=1)
@@ -0,0 +1,27 @@
+from app.statements import StatementRegistry
+
+
+def test_statements_are_reused_within_a_catalog_version():
+    registry = StatementRegistry()
+    assert registry.get(("2024_25", "all"), version=1) is None
+    registry.put(("2024_25", "all"), 1, "SELECT 1")
+    assert registry.get(("2024_25", "all"), version=1) == "SELECT 1"
+    assert (registry.hits, registry.misses) == (1, 1)
+
+
+def test_new_catalog_version_drops_every_statement():
+    registry = StatementRegistry()
+    registry.put("a", 1, "SELECT 1")
+    registry.put("b", 1, "SELECT 2")
+    assert registry.get("a", version=2) is None
+    assert len(registry) == 0
+
+
+def test_least_recently_used_statement_is_evicted():
+    registry = StatementRegistry(maxsize=2)
+    registry.put("a", 1, "A")
+    registry.put("b", 1, "B")
+    registry.get("a", 1)
+    registry.put("c", 1, "C")
+    assert registry.get("b", 1) is None
+    assert registry.get("a", 1) == "A"
@@ -0,0 +1,8 @@
+"""
+Search / import benchmarks against a running portal and a local Postgres.
+
+    python -m benchmarks.datagen load --years 2021_22,2022_23,2023_24 --groups 500
+    uvicorn app.main:app --port 8000
+    python -m benchmarks.run --base-url http://localhost:8000 -o before.json
+    python -m benchmarks.run compare before.json after.json
+"""
@@ -0,0 +1,86 @@
+import http.client
+import json
+import time
+import uuid
+from http.cookies import SimpleCookie
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlencode, urlsplit
+
+
+class Client:
+    """
+    Minimal keep-alive HTTP client (stdlib only) that carries the admin
+    session cookie.  One instance per thread – connections are not shared.
+    """
+
+    def __init__(self, base_url: str, timeout: float = 60):
+        parts = urlsplit(base_url)
+        conn_class = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+        self._conn    = conn_class(parts.hostname, parts.port, timeout=timeout)
+        self._cookies: Dict[str, str] = {}
+
+    def request(
+        self,
+        method: str,
+        path: str,
+        params: Optional[dict] = None,
+        body: Optional[bytes] = None,
+        headers: Optional[dict] = None
+    ) -> Tuple[int, bytes, float]:
+        """Returns ``(status, body, seconds)``; the body is fully read."""
+        if params:
+            path = f"{path}?{urlencode(params)}"
+        headers = dict(headers or {})
+        if self._cookies:
+            headers["Cookie"] = "; ".join(f"{k}={v}" for k, v in self._cookies.items())
+
+        start = time.perf_counter()
+        try:
+            self._conn.request(method, path, body=body, headers=headers)
+            response = self._conn.getresponse()
+            data     = response.read()
+        except (http.client.HTTPException, OSError):
+            self._conn.close()                   # reconnect on the next request
+            raise
+        elapsed = time.perf_counter() - start
+
+        for header in response.headers.get_all("Set-Cookie") or []:
+            cookie = SimpleCookie(header)
+            self._cookies.update({k: m.value for k, m in cookie.items()})
+        return response.status, data, elapsed
+
+    def json(self, method: str, path: str, **kwargs) -> dict:
+        status, data, _ = self.request(method, path, **kwargs)
+        if status >= 400:
+            raise RuntimeError(f"{method} {path} → {status}: {data[:200]!r}")
+        return json.loads(data) if data else {}
+
+    def login(self, username: str, password: str) -> None:
+        self.json(
+            "POST", "/api/admin/login",
+            body=urlencode({"username": username, "password": password}).encode(),
+            headers={"Content-Type": "application/x-www-form-urlencoded"},
+        )
+
+    def post_file(self, path: str, fields: Dict[str, str], filename: str, content: bytes) -> Tuple[int, bytes, float]:
+        body, content_type = encode_multipart(fields, "file", filename, content)
+        return self.request("POST", path, body=body, headers={"Content-Type": content_type})
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+def encode_multipart(fields: Dict[str, str], file_field: str, filename: str, content: bytes) -> Tuple[bytes, str]:
+    boundary = uuid.uuid4().hex
+    parts = []
+    for name, value in fields.items():
+        parts.append(
+            f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode()
+        )
+    parts.append(
+        f'--{boundary}\r\nContent-Disposition: form-data; name="{file_field}"; filename="{filename}"\r\n'
+        f"Content-Type: application/octet-stream\r\n\r\n".encode()
+        + content + b"\r\n"
+    )
+    parts.append(f"--{boundary}--\r\n".encode())
+    return b"".join(parts), f"multipart/form-data; boundary={boundary}"
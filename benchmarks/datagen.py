@@ -0,0 +1,153 @@
+"""
+Synthetic year tables shaped exactly like an Excel import.
+
+    python -m benchmarks.datagen load --years 2021_22,2022_23 --groups 500 --students 4
+    python -m benchmarks.datagen csv bench.csv --groups 500
+
+``load`` writes the tables through the importer (COPY + search indexes),
+``csv`` writes an upload file for the import benchmark.  The same seed
+always produces the same data.
+"""
+import argparse
+import asyncio
+import csv
+import random
+from typing import IO, Iterator, List, Sequence, Tuple
+
+TECHNIQUES = [
+    "Deep Learning", "Machine Learning", "IoT", "Blockchain", "Computer Vision",
+    "Natural Language Processing", "Cloud", "Edge Computing", "Reinforcement Learning",
+    "Federated Learning", "Android", "Augmented Reality", "Big Data", "Graph Neural Network",
+]
+DOMAINS = [
+    "Crop Disease", "Traffic", "Healthcare", "Attendance", "Fraud", "Air Quality",
+    "Sign Language", "Energy", "Waste Management", "Fake News", "Parking", "Library",
+    "Emotion", "Water Quality", "Supply Chain", "Student Performance", "Malware",
+]
+ARTIFACTS = [
+    "Detection System", "Prediction Platform", "Monitoring System", "Management Portal",
+    "Recommendation Engine", "Classification Model", "Tracking Application",
+    "Analysis Framework", "Chatbot", "Dashboard",
+]
+FIRST_NAMES = [
+    "Aditi", "Rahul", "Sneha", "Karthik", "Priya", "Vikram", "Ananya", "Rohan",
+    "Meera", "Arjun", "Divya", "Suresh", "Kavya", "Nikhil", "Pooja", "Harsha",
+    "Lakshmi", "Manoj", "Shreya", "Varun",
+]
+LAST_NAMES = [
+    "Sharma", "Rao", "Iyer", "Reddy", "Nair", "Kulkarni", "Patil", "Gowda",
+    "Hegde", "Menon", "Shetty", "Joshi", "Bhat", "Kumar", "Desai",
+]
+# never blank – the importer forward-fills empty cells from the row above
+OUTCOMES = ["Paper published", "Prototype", "Patent filed", "Hackathon winner", "Report submitted"]
+
+# Header of the upload template (see /api/admin/download-template)
+SHEET_HEADER = ("GROUP NO", "USN", "NAME", "PROJECT TITLE", "GUIDE NAME", "OUTCOMES", "PROOF LINK")
+
+
+def guide_pool(rng: random.Random, size: int = 40) -> List[str]:
+    return [
+        f"{rng.choice(['Dr.', 'Prof.'])} {rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+        for _ in range(size)
+    ]
+
+
+def project_title(rng: random.Random) -> str:
+    return f"{rng.choice(TECHNIQUES)} Based {rng.choice(DOMAINS)} {rng.choice(ARTIFACTS)}"
+
+
+def iter_sheet_rows(
+    year: str,
+    groups: int,
+    students: int,
+    seed: int = 0
+) -> Iterator[Tuple[str, ...]]:
+    """One row per student, like the sheets admins upload."""
+    rng    = random.Random(f"{seed}:{year}")
+    guides = guide_pool(rng)
+    batch  = year[2:4] if year[:4].isdigit() else "21"
+    for group_no in range(1, groups + 1):
+        title   = project_title(rng)
+        guide   = rng.choice(guides)
+        outcome = rng.choice(OUTCOMES)
+        proof   = f"https://example.org/proof/{year}/{group_no}"
+        for member in range(students):
+            usn  = f"1AB{batch}CS{(group_no - 1) * students + member + 1:03d}"
+            name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+            yield (str(group_no), usn, name, title, guide, outcome, proof)
+
+
+def iter_records(year: str, groups: int, students: int, seed: int = 0) -> Iterator[Tuple[str, ...]]:
+    """Grouped records in TABLE_COLUMNS order – what iter_groups yields for the sheet."""
+    rows: List[Sequence[str]] = []
+    for row in iter_sheet_rows(year, groups, students, seed):
+        if rows and rows[0][0] != row[0]:
+            yield _record(rows)
+            rows = []
+        rows.append(row)
+    if rows:
+        yield _record(rows)
+
+
+def _record(rows: List[Sequence[str]]) -> Tuple[str, ...]:
+    group_no, _, _, title, guide, outcome, proof = rows[0]
+    usns  = ", ".join(r[1] for r in rows)
+    names = ", ".join(r[2] for r in rows)
+    return (group_no, usns, names, title, guide, outcome, proof, "", "")
+
+
+def write_csv(out: IO[str], year: str, groups: int, students: int, seed: int = 0) -> None:
+    writer = csv.writer(out)
+    writer.writerow(SHEET_HEADER)
+    writer.writerows(iter_sheet_rows(year, groups, students, seed))
+
+
+# Query mix used by benchmarks.run – drawn from the same vocabulary
+def search_terms(seed: int = 0, count: int = 200) -> List[str]:
+    rng   = random.Random(seed)
+    words = TECHNIQUES + DOMAINS + LAST_NAMES
+    terms = {rng.choice(words) for _ in range(count)}
+    terms |= {f"{rng.choice(TECHNIQUES)} {rng.choice(DOMAINS)}" for _ in range(count)}
+    return sorted(terms)
+
+
+def misspell(term: str, rng: random.Random) -> str:
+    """Drop one letter, for the fuzzy search scenario."""
+    if len(term) < 5:
+        return term
+    i = rng.randrange(1, len(term) - 1)
+    return term[:i] + term[i + 1:]
+
+
+async def load(years: List[str], groups: int, students: int, seed: int) -> None:
+    from app.database import engine
+    from app.importer import import_table
+
+    for year in years:
+        count = await import_table(engine, year, iter_records(year, groups, students, seed))
+        print(f"[datagen] {year}: {count} groups")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate synthetic project data")
+    sub    = parser.add_subparsers(dest="command", required=True)
+
+    load_cmd = sub.add_parser("load", help="import synthetic year tables into DATABASE_URL")
+    load_cmd.add_argument("--years", default="2021_22,2022_23,2023_24")
+
+    csv_cmd = sub.add_parser("csv", help="write an upload sheet")
+    csv_cmd.add_argument("path")
+    csv_cmd.add_argument("--year", default="2024_25")
+
+    for cmd in (load_cmd, csv_cmd):
+        cmd.add_argument("--groups", type=int, default=300)
+        cmd.add_argument("--students", type=int, default=4)
+        cmd.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    if args.command == "load":
+        asyncio.run(load(args.years.split(","), args.groups, args.students, args.seed))
+    else:
+        with open(args.path, "w", newline="", encoding="utf-8") as fh:
+            write_csv(fh, args.year, args.groups, args.students, args.seed)
@@ -0,0 +1,237 @@
+"""
+Latency / throughput benchmark against a running portal.
+
+    python -m benchmarks.run --base-url http://localhost:8000 -o results.json
+    python -m benchmarks.run compare before.json after.json
+
+Load data first with ``python -m benchmarks.datagen load``.  Run the server
+with SEARCH_CACHE_SIZE=0 to measure the database path instead of the
+response cache.
+"""
+import argparse
+import io
+import itertools
+import json
+import os
+import platform
+import random
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+from benchmarks.client import Client
+from benchmarks.datagen import misspell, search_terms, write_csv
+from benchmarks.stats import compare, summarize
+
+SEARCH_TYPES = ("all", "title", "guide", "fuzzy")
+IMPORT_TABLE = "bench_import"
+
+
+def run_scenario(
+    base_url: str,
+    requests: int,
+    concurrency: int,
+    make_request: Callable[[Client, int], tuple],
+    setup: Optional[Callable[[Client], None]] = None
+) -> dict:
+    """
+    Fire ``requests`` calls of ``make_request(client, i)`` from
+    ``concurrency`` threads, each with its own keep-alive connection.
+    """
+    local   = threading.local()
+    clients = []
+
+    def call(i: int):
+        client = getattr(local, "client", None)
+        if client is None:
+            client = local.client = Client(base_url)
+            clients.append(client)
+            if setup:
+                setup(client)
+        try:
+            status, _, elapsed = make_request(client, i)
+            return elapsed, status >= 400
+        except Exception:                        # noqa: BLE001 – counted as error
+            return None, True
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        outcomes = list(pool.map(call, range(requests)))
+    wall = time.perf_counter() - start
+
+    for client in clients:
+        client.close()
+    latencies = [elapsed for elapsed, failed in outcomes if elapsed is not None and not failed]
+    errors    = sum(1 for _, failed in outcomes if failed)
+    return summarize(latencies, wall, errors)
+
+
+def search_scenarios(args, years: List[str]) -> Dict[str, dict]:
+    terms   = search_terms(args.seed)
+    rng     = random.Random(args.seed)
+    fuzzy   = [misspell(t, rng) for t in terms]
+    results = {}
+    for search_type, year in itertools.product(SEARCH_TYPES, [years[0], "all"]):
+        pool = fuzzy if search_type == "fuzzy" else terms
+
+        def make_request(client, i, pool=pool, search_type=search_type, year=year):
+            return client.request("GET", "/api/search/", params={
+                "q": pool[i % len(pool)], "year": year, "search_type": search_type,
+            })
+
+        name = f"search.{search_type}.{'all' if year == 'all' else 'one_year'}"
+        results[name] = run_scenario(args.base_url, args.requests, args.concurrency, make_request)
+        print(f"  {name:28} p50={results[name]['p50_ms']:8.2f} ms  p95={results[name]['p95_ms']:8.2f} ms")
+    return results
+
+
+def suggestion_scenario(args) -> Dict[str, dict]:
+    prefixes = sorted({t[:n] for t in search_terms(args.seed) for n in (2, 3, 5) if len(t) > n})
+
+    def make_request(client, i):
+        return client.request("GET", "/api/suggestions/", params={"q": prefixes[i % len(prefixes)], "year": "all"})
+
+    return {"suggestions.all": run_scenario(args.base_url, args.requests, args.concurrency, make_request)}
+
+
+def admin_read_scenario(args, table: str) -> Dict[str, dict]:
+    def make_request(client, i):
+        return client.request("GET", f"/api/admin/tables/{table}", params={"limit": 50})
+
+    def login(client):
+        client.login(args.admin_user, args.admin_password)
+
+    return {"admin.table_page": run_scenario(
+        args.base_url, args.requests, args.concurrency, make_request, setup=login
+    )}
+
+
+def import_scenario(args) -> Dict[str, dict]:
+    """End-to-end upload → job done, sequentially (imports are serialized server-side)."""
+    sheet = io.StringIO()
+    write_csv(sheet, "2024_25", args.import_groups, args.students, args.seed)
+    content = sheet.getvalue().encode()
+
+    client = Client(args.base_url)
+    client.login(args.admin_user, args.admin_password)
+    durations, errors = [], 0
+    start = time.perf_counter()
+    for _ in range(args.imports):
+        t0 = time.perf_counter()
+        status, body, _ = client.post_file(
+            "/api/admin/upload-excel", {"new_table": IMPORT_TABLE}, "bench.csv", content
+        )
+        if status >= 400:
+            errors += 1
+            continue
+        job_id = json.loads(body)["job_id"]
+        while True:
+            job = client.json("GET", f"/api/admin/jobs/{job_id}")
+            if job.get("finished"):
+                break
+            time.sleep(0.05)
+        if job.get("phase") == "failed":
+            errors += 1
+        else:
+            durations.append(time.perf_counter() - t0)
+    wall = time.perf_counter() - start
+    client.request("DELETE", f"/api/admin/tables/{IMPORT_TABLE}")
+    client.close()
+
+    summary = summarize(durations, wall, errors)
+    summary["rows"] = args.import_groups * args.students
+    return {"import.csv": summary}
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(args) -> dict:
+    client = Client(args.base_url)
+    years  = [y.replace("-", "_") for y in client.json("GET", "/api/years")["years"]]
+    client.close()
+    if not years:
+        raise SystemExit("No year tables – run `python -m benchmarks.datagen load` first")
+
+    results: Dict[str, dict] = {}
+    print("search:")
+    results.update(search_scenarios(args, [y.replace("_", "-") for y in years]))
+    results.update(suggestion_scenario(args))
+    if args.admin_password:
+        results.update(admin_read_scenario(args, years[0]))
+        if args.imports:
+            results.update(import_scenario(args))
+    else:
+        print("ADMIN_PASSWORD not set – skipping admin read and import scenarios")
+
+    return {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "base_url": args.base_url,
+            "python": platform.python_version(),
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "seed": args.seed,
+            "years": years,
+        },
+        "results": results,
+    }
+
+
+def print_comparison(before_path: str, after_path: str) -> None:
+    with open(before_path) as fh:
+        before = json.load(fh)
+    with open(after_path) as fh:
+        after = json.load(fh)
+    print(f"{before['meta'].get('commit')} → {after['meta'].get('commit')}")
+    for row in compare(before["results"], after["results"]):
+        cells = []
+        for metric in ("p50_ms", "p95_ms", "p99_ms", "throughput_rps"):
+            old, new, change = row[metric]
+            cells.append(f"{metric}={new:.2f} ({'n/a' if change is None else f'{change:+.1f}%'})")
+        print(f"  {row['scenario']:28} " + "  ".join(cells))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    sub = parser.add_subparsers(dest="command")
+    cmp = sub.add_parser("compare", help="compare two result files")
+    cmp.add_argument("before")
+    cmp.add_argument("after")
+
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--requests", type=int, default=200, help="requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--students", type=int, default=4)
+    parser.add_argument("--imports", type=int, default=3, help="import repetitions (0 = skip)")
+    parser.add_argument("--import-groups", type=int, default=1000)
+    parser.add_argument("--admin-user", default=os.getenv("ADMIN_USERNAME", "admin"))
+    parser.add_argument("--admin-password", default=os.getenv("ADMIN_PASSWORD"))
+    parser.add_argument("-o", "--output", help="write JSON results here (default: stdout)")
+    args = parser.parse_args()
+
+    if args.command == "compare":
+        print_comparison(args.before, args.after)
+        return
+
+    report = json.dumps(run(args), indent=2)
+    if args.output:
+        with open(args.output, "w") as fh:
+            fh.write(report)
+        print(f"results written to {args.output}")
+    else:
+        print(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+import math
+from typing import Dict, List, Sequence
+
+
+def percentile(values: Sequence[float], pct: float) -> float:
+    """Linear-interpolated percentile of ``values`` (0 ≤ pct ≤ 100)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank    = (len(ordered) - 1) * pct / 100
+    low     = math.floor(rank)
+    high    = math.ceil(rank)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def summarize(latencies: List[float], wall_seconds: float, errors: int = 0) -> Dict[str, float]:
+    """Latency percentiles in milliseconds plus throughput for one scenario."""
+    ms = [s * 1000 for s in latencies]
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "p50_ms": round(percentile(ms, 50), 3),
+        "p95_ms": round(percentile(ms, 95), 3),
+        "p99_ms": round(percentile(ms, 99), 3),
+        "mean_ms": round(sum(ms) / len(ms), 3) if ms else 0.0,
+        "min_ms": round(min(ms), 3) if ms else 0.0,
+        "max_ms": round(max(ms), 3) if ms else 0.0,
+        "throughput_rps": round(len(latencies) / wall_seconds, 2) if wall_seconds > 0 else 0.0,
+    }
+
+
+def compare(before: Dict[str, dict], after: Dict[str, dict], metrics=("p50_ms", "p95_ms", "p99_ms", "throughput_rps")) -> List[dict]:
+    """Per-scenario ``{metric: (before, after, change %)}`` for scenarios in both runs."""
+    rows = []
+    for name in sorted(set(before) & set(after)):
+        row = {"scenario": name}
+        for metric in metrics:
+            old, new = before[name].get(metric, 0.0), after[name].get(metric, 0.0)
+            change   = round((new - old) / old * 100, 1) if old else None
+            row[metric] = (old, new, change)
+        rows.append(row)
+    return rows
@@ -0,0 +1,42 @@
+import io
+
+from app.spreadsheet import TABLE_COLUMNS, iter_groups, read_rows
+from benchmarks.client import encode_multipart
+from benchmarks.datagen import iter_records, write_csv
+from benchmarks.stats import compare, percentile, summarize
+
+
+def test_percentile_interpolates():
+    assert percentile([1, 2, 3, 4], 50) == 2.5
+    assert percentile([5], 99) == 5
+    assert percentile([], 95) == 0.0
+
+
+def test_summarize_reports_milliseconds_and_throughput():
+    summary = summarize([0.01, 0.02, 0.03], wall_seconds=0.5, errors=1)
+    assert summary["p50_ms"] == 20.0
+    assert summary["throughput_rps"] == 6.0
+    assert summary["errors"] == 1
+
+
+def test_compare_reports_relative_change():
+    (row,) = compare({"s": {"p50_ms": 10.0}}, {"s": {"p50_ms": 8.0}, "new": {}}, metrics=("p50_ms",))
+    assert row == {"scenario": "s", "p50_ms": (10.0, 8.0, -20.0)}
+
+
+def test_generated_sheet_imports_like_the_direct_records():
+    sheet = io.StringIO()
+    write_csv(sheet, "2024_25", groups=20, students=3, seed=7)
+    upload = io.BytesIO(sheet.getvalue().encode())
+
+    imported = list(iter_groups(read_rows(upload, "bench.csv")))
+    direct   = list(iter_records("2024_25", groups=20, students=3, seed=7))
+    assert imported == direct
+    assert len(direct) == 20 and len(direct[0]) == len(TABLE_COLUMNS)
+
+
+def test_multipart_body_carries_fields_and_file():
+    body, content_type = encode_multipart({"new_table": "t"}, "file", "a.csv", b"x,y")
+    boundary = content_type.split("boundary=")[1]
+    assert body.startswith(f"--{boundary}".encode()) and body.endswith(f"--{boundary}--\r\n".encode())
+    assert b'name="new_table"\r\n\r\nt\r\n' in body and b"x,y" in body